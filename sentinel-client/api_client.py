@@ -5,15 +5,24 @@ Communicates with the Sentinel verification API.
 Supports hybrid mode: remote-first with local cache fallback.
 """
 
+import queue
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Literal
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from local_cache import LocalCache, init_cache_from_golden_set
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PluginInfo:
     """Plugin metadata from verification."""
 
@@ -23,7 +32,7 @@ class PluginInfo:
     author: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScanResult:
     """Individual hash verification result."""
 
@@ -33,7 +42,7 @@ class ScanResult:
     source: Literal["remote", "cached"] = "remote"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScanResponse:
     """API scan response."""
 
@@ -61,6 +70,16 @@ class SentinelClient:
     # Production Cloudflare Worker URL
     DEFAULT_URL = "https://sentinel-worker.seanpayomo-work.workers.dev"
 
+    # Max verified/revoked results remembered across scans
+    MEMO_SIZE = 100_000
+
+    # Keep-alive pool size, so concurrent scans reuse TLS connections
+    POOL_SIZE = 32
+
+    # Worker limit on hashes per request, and how many batches run at once
+    MAX_BATCH_SIZE = 500
+    BATCH_WORKERS = 4
+
     def __init__(self, base_url: str | None = None, timeout: int = 30):
         """
         Initialize the client.
@@ -72,12 +91,35 @@ class SentinelClient:
         self.base_url = (base_url or self.DEFAULT_URL).rstrip("/")
         self.timeout = timeout
         self.session = requests.Session()
+        # Scan is a read-only lookup, so POST is safe to retry. Only gateway
+        # errors are retried: a stalled worker should fail after one timeout
+        # so HybridVerifier can fall back to the cache promptly
+        retry = Retry(
+            total=3,
+            connect=0,
+            read=0,
+            status=3,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_SIZE,
+            pool_maxsize=self.POOL_SIZE,
+            max_retries=retry,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update(
             {
                 "Content-Type": "application/json",
                 "User-Agent": "SkyrimSentinel/1.0",
             }
         )
+        self._memo: OrderedDict[str, ScanResult] = OrderedDict()
+        self._memo_lock = threading.Lock()
+        # Send hashes as one concatenated string until the worker rejects it
+        self._packed_hashes = True
 
     def health_check(self) -> bool:
         """
@@ -99,6 +141,10 @@ class SentinelClient:
         """
         Submit hashes for verification.
 
+        Verified and revoked results are memoized per hash, so only hashes
+        not seen before (or previously unknown) are sent to the API. More
+        than MAX_BATCH_SIZE hashes are split into concurrent requests.
+
         Args:
             hashes: List of SHA-256 hash strings
 
@@ -112,49 +158,205 @@ class SentinelClient:
         if not hashes:
             raise ValueError("Hashes list cannot be empty")
 
+        normalized = [h.lower() for h in hashes]
+
+        with self._memo_lock:
+            known = {}
+            for h in normalized:
+                if h in self._memo:
+                    self._memo.move_to_end(h)
+                    known[h] = self._memo[h]
+
+        missing = list(dict.fromkeys(h for h in normalized if h not in known))
+        fetched = {r.hash.lower(): r for r in self._fetch(missing)} if missing else {}
+        self._remember(fetched.values())
+
+        results = [
+            known.get(h) or fetched.get(h) or ScanResult(hash=h, status="unknown")
+            for h in normalized
+        ]
+
+        return ScanResponse(
+            scanned=len(results),
+            verified=sum(1 for r in results if r.status == "verified"),
+            unknown=sum(1 for r in results if r.status == "unknown"),
+            revoked=sum(1 for r in results if r.status == "revoked"),
+            results=results,
+            source="remote",
+        )
+
+    def _fetch(self, hashes: list[str]) -> list[ScanResult]:
+        """POST hashes in batches the worker accepts, several at a time."""
+        if len(hashes) <= self.MAX_BATCH_SIZE:
+            return self._post_scan(hashes)
+
+        batches = [
+            hashes[i : i + self.MAX_BATCH_SIZE] for i in range(0, len(hashes), self.MAX_BATCH_SIZE)
+        ]
+        with ThreadPoolExecutor(max_workers=self.BATCH_WORKERS) as executor:
+            return [r for results in executor.map(self._post_scan, batches) for r in results]
+
+    def _post_scan(self, hashes: list[str]) -> list[ScanResult]:
+        """POST hashes to the scan endpoint and parse the results."""
+        packed = self._packed_hashes and all(len(h) == 64 for h in hashes)
         response = self.session.post(
             f"{self.base_url}/api/v1/scan",
-            json={"hashes": hashes},
+            data=orjson.dumps({"hashes": "".join(hashes) if packed else hashes}),
             timeout=self.timeout,
         )
 
-        data = response.json()
+        try:
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            # Same exception type requests' response.json() raises
+            raise requests.exceptions.InvalidJSONError(str(e), response=response) from e
 
         if response.status_code != 200:
+            if packed and data.get("code") == "INVALID_REQUEST":
+                # Older worker only accepts a hash array
+                self._packed_hashes = False
+                return self._post_scan(hashes)
             raise SentinelAPIError(
                 data.get("error", "Unknown error"),
                 data.get("code"),
             )
 
-        # Parse results
-        results = []
-        for item in data.get("results", []):
-            plugin = None
-            if item.get("plugin"):
-                plugin = PluginInfo(
-                    name=item["plugin"]["name"],
-                    nexus_id=item["plugin"]["nexusId"],
-                    filename=item["plugin"].get("filename"),
-                    author=item["plugin"].get("author"),
-                )
-
-            results.append(
-                ScanResult(
-                    hash=item["hash"],
-                    status=item["status"],
-                    plugin=plugin,
-                    source="remote",
+        return [
+            ScanResult(
+                hash=item["hash"],
+                status=item["status"],
+                plugin=PluginInfo(
+                    name=p["name"],
+                    nexus_id=p["nexusId"],
+                    filename=p.get("filename"),
+                    author=p.get("author"),
                 )
+                if (p := item.get("plugin"))
+                else None,
+                source="remote",
             )
+            for item in data.get("results", [])
+        ]
+
+    def _remember(self, results: Iterable[ScanResult]) -> None:
+        """Memoize verified/revoked results, evicting least recently used."""
+        with self._memo_lock:
+            for result in results:
+                # Unknown hashes may be added to the Golden Set later
+                if result.status == "unknown":
+                    continue
+                self._memo[result.hash.lower()] = result
+                self._memo.move_to_end(result.hash.lower())
+            while len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+
+
+class BatchingSentinelClient:
+    """
+    Coalesces individual hash lookups into batched scan requests.
 
-        return ScanResponse(
-            scanned=data.get("scanned", 0),
-            verified=data.get("verified", 0),
-            unknown=data.get("unknown", 0),
-            revoked=data.get("revoked", 0),
-            results=results,
-            source="remote",
-        )
+    Lookups submitted within a short window (or until the batch is full)
+    share one POST, so callers verifying hashes independently pay the
+    HTTP round trip once. Batches are sent on a background executor, so
+    scan_async never blocks on the network.
+    """
+
+    def __init__(
+        self,
+        client: SentinelClient | None = None,
+        batch_interval_ms: int = 10,
+        max_batch_size: int = 500,
+    ):
+        """
+        Initialize the batching client.
+
+        Args:
+            client: Underlying client (default: new SentinelClient)
+            batch_interval_ms: How long to wait for more hashes before sending
+            max_batch_size: Send immediately once this many hashes are pending
+        """
+        self.client = client or SentinelClient()
+        self.batch_interval = batch_interval_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._pending: dict[str, list[Future[ScanResult]]] = {}
+        self._timer: threading.Timer | None = None
+        self._executor = ThreadPoolExecutor(max_workers=SentinelClient.BATCH_WORKERS)
+        self._closed = False
+
+    def scan_async(self, hash_str: str) -> Future[ScanResult]:
+        """
+        Queue a hash for verification.
+
+        Args:
+            hash_str: SHA-256 hash string
+
+        Returns:
+            Future resolving to the ScanResult for this hash
+
+        Raises:
+            RuntimeError: If the client has been closed
+        """
+        future: Future[ScanResult] = Future()
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchingSentinelClient is closed")
+            self._pending.setdefault(hash_str.lower(), []).append(future)
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch(self._take_batch())
+            elif self._timer is None:
+                self._timer = threading.Timer(self.batch_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        return future
+
+    def flush(self) -> None:
+        """Send all pending hashes now, without waiting for the timer."""
+        with self._lock:
+            if self._pending:
+                self._dispatch(self._take_batch())
+
+    def close(self) -> None:
+        """Send pending hashes, stop the timer and wait for in-flight batches."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._pending:
+                self._dispatch(self._take_batch())
+        self._executor.shutdown(wait=True)
+
+    def _take_batch(self) -> dict[str, list[Future[ScanResult]]]:
+        """Detach the pending batch and cancel its timer (lock must be held)."""
+        batch, self._pending = self._pending, {}
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _dispatch(self, batch: dict[str, list[Future[ScanResult]]]) -> None:
+        """Hand a batch to the executor (lock must be held)."""
+        self._executor.submit(self._send, batch)
+
+    def _send(self, batch: dict[str, list[Future[ScanResult]]]) -> None:
+        """POST one batch and resolve its futures."""
+        try:
+            response = self.client.scan(list(batch))
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        by_hash = {r.hash.lower(): r for r in response.results}
+        for hash_str, futures in batch.items():
+            result = by_hash.get(hash_str) or ScanResult(hash=hash_str, status="unknown")
+            for future in futures:
+                if not future.done():
+                    future.set_result(result)
 
 
 class HybridVerifier:
@@ -165,6 +367,10 @@ class HybridVerifier:
     Falls back to local cache for offline use or network issues.
     """
 
+    # verify_stream flushes a batch once it is this large or this old (seconds)
+    STREAM_BATCH_SIZE = 500
+    STREAM_FLUSH_INTERVAL = 0.05
+
     def __init__(
         self,
         remote_timeout: int = 5,
@@ -214,6 +420,86 @@ class HybridVerifier:
         self._last_source = "cached"
         return self._verify_from_cache(hashes)
 
+    def verify_stream(self, hashes: Iterable[str]) -> Iterator[ScanResult]:
+        """
+        Verify hashes as they are produced, yielding results per batch.
+
+        The source iterator runs on its own thread, so a slow producer
+        (e.g. a scan hashing a large file) doesn't hold back a partial
+        batch: batches are sent once they reach STREAM_BATCH_SIZE or are
+        STREAM_FLUSH_INTERVAL old, and finished batches are yielded while
+        the producer is still working. Results are yielded in input order.
+
+        Args:
+            hashes: Iterable of SHA-256 hashes, e.g. fed by an ongoing scan
+
+        Yields:
+            ScanResult for each input hash
+
+        Raises:
+            Exception: Whatever the source iterator raised, after the
+                batches before it have been yielded
+        """
+        # None marks the end of the source
+        source: queue.Queue[str | None] = queue.Queue()
+        errors: list[BaseException] = []
+
+        def feed() -> None:
+            try:
+                for hash_str in hashes:
+                    source.put(hash_str)
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                source.put(None)
+
+        threading.Thread(target=feed, daemon=True).start()
+
+        pending: list[Future[ScanResponse]] = []
+        batch: list[str] = []
+        batch_started = 0.0
+        exhausted = False
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while not exhausted:
+                # Wake up to flush an aging batch, or to report finished ones
+                timeout = None
+                if batch:
+                    timeout = max(
+                        0.0, batch_started + self.STREAM_FLUSH_INTERVAL - time.monotonic()
+                    )
+                elif pending:
+                    timeout = self.STREAM_FLUSH_INTERVAL
+
+                try:
+                    item = source.get(timeout=timeout)
+                except queue.Empty:
+                    pass
+                else:
+                    if item is None:
+                        exhausted = True
+                    else:
+                        if not batch:
+                            batch_started = time.monotonic()
+                        batch.append(item)
+
+                if batch and (
+                    exhausted
+                    or len(batch) >= self.STREAM_BATCH_SIZE
+                    or time.monotonic() - batch_started >= self.STREAM_FLUSH_INTERVAL
+                ):
+                    pending.append(executor.submit(self.verify, batch))
+                    batch = []
+
+                while pending and pending[0].done():
+                    yield from pending.pop(0).result().results
+
+            for future in pending:
+                yield from future.result().results
+
+        if errors:
+            raise errors[0]
+
     def _verify_from_cache(self, hashes: list[str]) -> ScanResponse:
         """Verify hashes using local cache."""
         cache_results = self.cache.get_batch(hashes)
@@ -223,7 +509,9 @@ class HybridVerifier:
         unknown = 0
         revoked = 0
 
-        for hash_str, cached in cache_results.items():
+        # Walk the input, not the dict, so duplicates each get a result
+        for hash_str in (h.lower() for h in hashes):
+            cached = cache_results[hash_str]
             if cached is None:
                 unknown += 1
                 results.append(
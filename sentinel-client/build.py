@@ -1,14 +1,14 @@
 """
 Skyrim Sentinel - PyInstaller Build Script
 
-Creates a standalone Windows executable using PyInstaller.
+Creates a standalone Windows application folder using PyInstaller.
 
 Usage:
     uv sync --extra build
     uv run python build.py
 
 Output:
-    dist/SkyrimSentinel.exe
+    dist/SkyrimSentinel/SkyrimSentinel.exe
 """
 
 import shutil
@@ -22,6 +22,7 @@ from version import APP_NAME, __version__
 OUTPUT_DIR = Path("dist")
 MAIN_SCRIPT = "main.py"
 EXE_NAME = "SkyrimSentinel"
+EXCLUDED_MODULES = ("tkinter.test", "unittest", "pydoc", "turtle", "idlelib", "test")
 
 
 def get_customtkinter_path() -> Path | None:
@@ -56,7 +57,8 @@ def build():
         sys.executable,
         "-m",
         "PyInstaller",
-        "--onefile",
+        # onedir: no payload extraction to a temp folder on every launch
+        "--onedir",
         "--windowed",
         "--clean",
         f"--name={EXE_NAME}",
@@ -65,6 +67,10 @@ def build():
         f"--add-data={ctk_path};customtkinter",
         # Hidden imports that PyInstaller might miss
         "--hidden-import=PIL._tkinter_finder",
+        # Unused stdlib pulled in transitively; keeps the bundle small
+        *(f"--exclude-module={mod}" for mod in EXCLUDED_MODULES),
+        # Bytecode-compile with -O (strips asserts)
+        "--optimize=1",
         MAIN_SCRIPT,
     ]
 
@@ -80,7 +86,7 @@ def build():
         print()
         print("=" * 50)
         print("✅ Build successful!")
-        print(f"   Output: {OUTPUT_DIR / EXE_NAME}.exe")
+        print(f"   Output: {OUTPUT_DIR / EXE_NAME / EXE_NAME}.exe")
 
         # Clean up build artifacts
         build_dir = Path("build")
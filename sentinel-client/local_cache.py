@@ -7,6 +7,9 @@ Loaded from golden_set.json for fallback when remote API unavailable.
 
 import json
 import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -21,6 +24,42 @@ class CachedPlugin:
     status: str = "verified"
 
 
+def _hash_key(sha256: str) -> bytes | None:
+    """Convert a hex hash to its 32-byte key, or None if it isn't a SHA-256."""
+    try:
+        key = bytes.fromhex(sha256)
+    except ValueError:
+        return None
+    return key if len(key) == 32 else None
+
+
+class _BloomFilter:
+    """
+    In-memory Bloom filter over 32-byte SHA-256 keys.
+
+    SHA-256 output is already uniformly distributed, so the bit positions
+    are read straight from 4-byte slices of the key instead of rehashing.
+    """
+
+    HASH_COUNT = 7
+    BITS_PER_KEY = 10  # ~1% false positives with 7 probes
+
+    def __init__(self, keys: list[bytes]):
+        num_bits = 1 << (max(1024, len(keys) * self.BITS_PER_KEY) - 1).bit_length()
+        self._mask = num_bits - 1
+        self._bits = bytearray(num_bits // 8)
+        for key in keys:
+            for pos in self._positions(key):
+                self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def _positions(self, key: bytes) -> Iterator[int]:
+        for i in range(0, 4 * self.HASH_COUNT, 4):
+            yield int.from_bytes(key[i : i + 4]) & self._mask
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
 class LocalCache:
     """
     SQLite-based local cache for hash verification.
@@ -33,6 +72,9 @@ class LocalCache:
     DEFAULT_CACHE_PATH = Path(__file__).parent / "cache" / "sentinel.db"
     DEFAULT_GOLDEN_SET = Path(__file__).parent.parent / "tools" / "golden_set.json"
 
+    # Bumped when the table layout changes; older caches are rebuilt
+    SCHEMA_VERSION = 3
+
     def __init__(self, db_path: Path | None = None):
         """
         Initialize the local cache.
@@ -42,14 +84,34 @@ class LocalCache:
         """
         self.db_path = db_path or self.DEFAULT_CACHE_PATH
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One long-lived connection; setup cost is paid once, not per query
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
         self._init_db()
 
     def _init_db(self) -> None:
-        """Initialize the database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        """Configure the connection and initialize the database schema."""
+        with self._lock:
+            conn = self._conn
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA cache_size=-65536")
+
+            # v1 stored hashes as hex TEXT and v2 file_cache rows had no inode;
+            # hashes are reloaded from the golden set, files are rehashed
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < self.SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS hashes")
+                conn.execute("DROP TABLE IF EXISTS file_cache")
+                conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+
+            # Hashes are stored as raw 32-byte digests, half the size of hex text
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS hashes (
-                    sha256 TEXT PRIMARY KEY,
+                    sha256 BLOB PRIMARY KEY,
                     name TEXT NOT NULL,
                     nexus_id INTEGER NOT NULL,
                     filename TEXT,
@@ -60,7 +122,63 @@ class LocalCache:
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_status ON hashes(status)
             """)
-            conn.commit()
+            # Last known hash of each scanned file, keyed by absolute path
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS file_cache (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    sha256 BLOB NOT NULL
+                )
+            """)
+            # Per-connection scratch table holding the hashes of a batch lookup
+            conn.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS batch_query (
+                    sha256 BLOB PRIMARY KEY
+                )
+            """)
+            self._rebuild_filter()
+
+    def _rebuild_filter(self) -> None:
+        """Rebuild the Bloom filter from the table (lock must be held)."""
+        keys = [row[0] for row in self._conn.execute("SELECT sha256 FROM hashes")]
+        self._filter = _BloomFilter(keys)
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _sync_filter(self) -> None:
+        """
+        Rebuild the Bloom filter if another connection wrote to the database.
+
+        data_version only changes on commits from other connections (other
+        LocalCache instances or processes), so the filter stays valid as a
+        guaranteed miss while it's unchanged. Lock must be held.
+        """
+        if self._conn.execute("PRAGMA data_version").fetchone()[0] != self._data_version:
+            self._rebuild_filter()
+
+    @contextmanager
+    def _transaction(self, write: bool = True) -> Iterator[sqlite3.Connection]:
+        """
+        Hold the connection lock and run the block in one transaction.
+
+        Write transactions take the database write lock up front; read-only
+        ones (write=False) start deferred, so they only take a shared lock
+        and never queue behind or block other connections' writes.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
 
     def get(self, sha256: str) -> CachedPlugin | None:
         """
@@ -72,27 +190,35 @@ class LocalCache:
         Returns:
             CachedPlugin if found, None otherwise
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
+        key = _hash_key(sha256)
+        if key is None:
+            return None
+
+        with self._lock:
+            self._sync_filter()
+            if key not in self._filter:
+                return None
+            cursor = self._conn.execute(
                 "SELECT name, nexus_id, filename, status FROM hashes WHERE sha256 = ?",
-                (sha256.lower(),),
+                (key,),
             )
             row = cursor.fetchone()
 
-            if row is None:
-                return None
+        if row is None:
+            return None
 
-            return CachedPlugin(
-                name=row["name"],
-                nexus_id=row["nexus_id"],
-                filename=row["filename"],
-                status=row["status"],
-            )
+        return CachedPlugin(
+            name=row["name"],
+            nexus_id=row["nexus_id"],
+            filename=row["filename"],
+            status=row["status"],
+        )
 
     def get_batch(self, hashes: list[str]) -> dict[str, CachedPlugin | None]:
         """
-        Look up multiple hashes in batches.
+        Look up multiple hashes with a single join.
+
+        Hashes the Bloom filter rules out are answered without a table lookup.
 
         Args:
             hashes: List of SHA-256 hashes
@@ -102,20 +228,28 @@ class LocalCache:
         """
         results = {}
         normalized = [h.lower() for h in hashes]
-
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            # SQLite has a limit on parameters, process in chunks
-            chunk_size = 500
-            for i in range(0, len(normalized), chunk_size):
-                chunk = normalized[i : i + chunk_size]
-                placeholders = ",".join("?" * len(chunk))
-                cursor = conn.execute(
-                    f"SELECT sha256, name, nexus_id, filename, status FROM hashes WHERE sha256 IN ({placeholders})",
-                    chunk,
+        with self._lock:
+            self._sync_filter()
+            maybe_hits = [
+                key for h in normalized if (key := _hash_key(h)) is not None and key in self._filter
+            ]
+
+        if maybe_hits:
+            # Stage the hashes in a temp table so the lookup is planned once
+            # and walks the primary key index, whatever the batch size. Only
+            # the TEMP table is written, so no write lock on the cache is needed
+            with self._transaction(write=False) as conn:
+                conn.execute("DELETE FROM batch_query")
+                conn.executemany(
+                    "INSERT OR IGNORE INTO batch_query (sha256) VALUES (?)",
+                    ((key,) for key in maybe_hits),
                 )
+                cursor = conn.execute("""
+                    SELECT h.sha256, h.name, h.nexus_id, h.filename, h.status
+                    FROM batch_query q JOIN hashes h USING (sha256)
+                """)
                 for row in cursor:
-                    results[row["sha256"]] = CachedPlugin(
+                    results[row["sha256"].hex()] = CachedPlugin(
                         name=row["name"],
                         nexus_id=row["nexus_id"],
                         filename=row["filename"],
@@ -147,42 +281,93 @@ class LocalCache:
         with open(path, encoding="utf-8") as f:
             data = json.load(f)
 
-        count = 0
-        with sqlite3.connect(self.db_path) as conn:
-            for plugin in data.get("plugins", []):
-                for file_entry in plugin.get("files", []):
-                    sha256 = file_entry.get("sha256")
-                    if sha256:
-                        conn.execute(
-                            """
-                            INSERT OR REPLACE INTO hashes
-                            (sha256, name, nexus_id, filename, status)
-                            VALUES (?, ?, ?, ?, ?)
-                        """,
-                            (
-                                sha256.lower(),
-                                plugin["name"],
-                                plugin["nexusId"],
-                                file_entry.get("filename"),
-                                file_entry.get("status", "verified"),
-                            ),
-                        )
-                        count += 1
-            conn.commit()
-
-        return count
+        rows = [
+            (
+                bytes.fromhex(sha256),
+                plugin["name"],
+                plugin["nexusId"],
+                file_entry.get("filename"),
+                file_entry.get("status", "verified"),
+            )
+            for plugin in data.get("plugins", [])
+            for file_entry in plugin.get("files", [])
+            if (sha256 := file_entry.get("sha256"))
+        ]
+
+        # One prepared statement and one commit for the whole golden set
+        with self._transaction() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO hashes
+                (sha256, name, nexus_id, filename, status)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            self._rebuild_filter()
+
+        return len(rows)
+
+    def get_file_hash(self, path: str, size: int, mtime_ns: int, inode: int) -> str | None:
+        """
+        Look up the remembered hash of a file.
+
+        The inode is part of the key so a different file moved into place
+        with the same size and mtime (e.g. ``cp -p``) is hashed again.
+
+        Args:
+            path: Absolute file path
+            size: Current file size in bytes
+            mtime_ns: Current modification time in nanoseconds
+            inode: Current inode (file index on Windows)
+
+        Returns:
+            Hex SHA-256 if the file is unchanged since it was hashed, None otherwise
+        """
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT sha256 FROM file_cache
+                WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?
+                """,
+                (path, size, mtime_ns, inode),
+            ).fetchone()
+
+        return row["sha256"].hex() if row else None
+
+    def put_file_hashes(self, entries: list[tuple[str, int, int, int, str]]) -> None:
+        """
+        Remember file hashes for later scans.
+
+        Args:
+            entries: (path, size, mtime_ns, inode, sha256) tuples
+        """
+        if not entries:
+            return
+
+        with self._transaction() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO file_cache (path, size, mtime_ns, inode, sha256)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    (path, size, mtime_ns, inode, bytes.fromhex(h))
+                    for path, size, mtime_ns, inode, h in entries
+                ),
+            )
 
     def count(self) -> int:
         """Return number of entries in cache."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM hashes")
+        with self._lock:
+            cursor = self._conn.execute("SELECT COUNT(*) FROM hashes")
             return cursor.fetchone()[0]
 
     def clear(self) -> None:
         """Clear all entries from cache."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM hashes")
-            conn.commit()
+        with self._lock:
+            self._conn.execute("DELETE FROM hashes")
+            self._rebuild_filter()
 
 
 def init_cache_from_golden_set() -> LocalCache:
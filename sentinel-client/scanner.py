@@ -5,29 +5,61 @@ Discovers and hashes DLL files in mod directories.
 """
 
 import hashlib
+import mmap
+import os
 from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-# 64KB chunks for memory-efficient hashing
-CHUNK_SIZE = 65536
+from local_cache import LocalCache
 
+# Files up to this size are read into memory in one call
+SMALL_FILE_SIZE = 1024 * 1024
 
-def find_dlls(directory: Path) -> Iterator[Path]:
+# Files larger than this are streamed through hashlib.file_digest instead of mmap
+MMAP_MAX_SIZE = 512 * 1024 * 1024
+
+# hashlib releases the GIL while hashing, so threads give real parallelism;
+# beyond 8 workers the disk, not the CPU, is the bottleneck
+MAX_WORKERS = min(8, os.cpu_count() or 4)
+
+
+def find_dlls(directory: Path) -> Iterator[os.DirEntry[str]]:
     """
     Recursively find all .dll files in a directory.
 
+    Walks with os.scandir so each entry carries the type and stat data
+    from the directory listing. Symlinked DLLs (as deployed by mod
+    managers) are included, but symlinked directories are not descended
+    into, so link loops can't recurse. Unreadable subdirectories are
+    skipped.
+
     Args:
         directory: Root directory to search
 
     Yields:
-        Path objects for each .dll file found
+        DirEntry objects for each .dll file found
     """
-    yield from directory.rglob("*.dll")
+    stack = [os.fspath(directory)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.lower().endswith(".dll") and entry.is_file():
+                        yield entry
+        except OSError:
+            continue
 
 
-def hash_file(file_path: Path) -> str:
+def hash_file(file_path: str | Path) -> str:
     """
-    Generate SHA-256 hash of a file using chunked reading.
+    Generate SHA-256 hash of a file.
+
+    Small files are read in one call and typical DLLs are memory-mapped,
+    so the whole buffer is hashed in a single update. Very large files
+    are streamed with hashlib.file_digest.
 
     Args:
         file_path: Path to the file to hash
@@ -39,55 +71,121 @@ def hash_file(file_path: Path) -> str:
         FileNotFoundError: If the file doesn't exist
         PermissionError: If the file can't be read
     """
-    sha256 = hashlib.sha256()
-
     with open(file_path, "rb") as f:
-        while chunk := f.read(CHUNK_SIZE):
-            sha256.update(chunk)
+        size = os.fstat(f.fileno()).st_size
+
+        if size <= SMALL_FILE_SIZE:
+            return hashlib.sha256(f.read()).hexdigest()
+
+        # Ask the kernel to read ahead while the current pages are hashed
+        # (POSIX only; Windows detects sequential access on its own)
+        if size <= MMAP_MAX_SIZE:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except OSError, ValueError:
+                # Truncated since the fstat (empty files can't be mapped)
+                return hashlib.file_digest(f, "sha256").hexdigest()
 
-    return sha256.hexdigest()
+            with mm:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                return hashlib.sha256(mm).hexdigest()
+
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _hash_one(
+    directory: Path,
+    entry: os.DirEntry[str],
+    file_cache: LocalCache | None = None,
+) -> tuple[dict, tuple[str, int, int, int, str] | None]:
+    """
+    Hash a single DLL and build its scan result entry.
+
+    Args:
+        directory: Scan root, used to compute the relative path
+        entry: DLL file to hash
+        file_cache: Optional cache of hashes from previous scans
+
+    Returns:
+        Tuple of the result dict (with an "error" key instead of a hash on
+        failure) and a file cache entry to store, or None if nothing changed
+    """
+    rel_path = os.path.relpath(entry.path, directory)
+    try:
+        st = entry.stat()
+        abs_path = os.path.abspath(entry.path)
+        cache_entry = None
+        if file_cache is not None:
+            # DirEntry.stat() leaves st_ino at 0 on Windows; a full stat fills it
+            inode = st.st_ino or os.stat(entry.path).st_ino
+            file_hash = file_cache.get_file_hash(abs_path, st.st_size, st.st_mtime_ns, inode)
+            if file_hash is None:
+                file_hash = hash_file(entry.path)
+                cache_entry = (abs_path, st.st_size, st.st_mtime_ns, inode, file_hash)
+        else:
+            file_hash = hash_file(entry.path)
+
+        result = {
+            "filename": entry.name,
+            "path": rel_path,
+            "sha256": file_hash,
+            "size_bytes": st.st_size,
+        }
+        return result, cache_entry
+    except (PermissionError, OSError) as e:
+        result = {
+            "filename": entry.name,
+            "path": rel_path,
+            "sha256": None,
+            "error": str(e),
+        }
+        return result, None
 
 
 def scan_directory(
     directory: Path,
     progress_callback: Callable[[int, int, str], None] | None = None,
+    file_cache: LocalCache | None = None,
 ) -> list[dict]:
     """
     Scan a directory for DLL files and generate hashes.
 
+    Files are hashed concurrently on a thread pool, starting as soon as
+    they are discovered rather than after the whole tree is walked.
+    Results keep the discovery order; progress is reported as each file
+    completes.
+    With a file cache, files whose size, mtime and inode are unchanged since
+    the last scan reuse their stored hash instead of being read again.
+
     Args:
         directory: Directory to scan
         progress_callback: Optional callback(current, total, filename)
+        file_cache: Optional LocalCache used to remember file hashes
 
     Returns:
         List of dicts with filename, path, and sha256 keys
     """
-    results = []
-    dll_files = list(find_dlls(directory))
-    total = len(dll_files)
-
-    for i, dll_path in enumerate(dll_files, 1):
-        if progress_callback:
-            progress_callback(i, total, dll_path.name)
-
-        try:
-            file_hash = hash_file(dll_path)
-            results.append(
-                {
-                    "filename": dll_path.name,
-                    "path": str(dll_path.relative_to(directory)),
-                    "sha256": file_hash,
-                    "size_bytes": dll_path.stat().st_size,
-                }
-            )
-        except (PermissionError, OSError) as e:
-            results.append(
-                {
-                    "filename": dll_path.name,
-                    "path": str(dll_path.relative_to(directory)),
-                    "sha256": None,
-                    "error": str(e),
-                }
-            )
+    futures = {}
+    new_entries = []
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for i, entry in enumerate(find_dlls(directory)):
+            futures[executor.submit(_hash_one, directory, entry, file_cache)] = i
+
+        total = len(futures)
+        results: list[dict] = [{}] * total
+        for done, future in enumerate(as_completed(futures), 1):
+            result, cache_entry = future.result()
+            results[futures[future]] = result
+            if cache_entry:
+                new_entries.append(cache_entry)
+            if progress_callback:
+                progress_callback(done, total, result["filename"])
+
+    if file_cache is not None:
+        file_cache.put_file_hashes(new_entries)
 
     return results
@@ -0,0 +1,358 @@
+"""
+Tests for the Skyrim Sentinel API client.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+import orjson
+import pytest
+import requests
+
+# Import the module under test
+from api_client import (
+    BatchingSentinelClient,
+    HybridVerifier,
+    ScanResponse,
+    ScanResult,
+    SentinelAPIError,
+    SentinelClient,
+)
+from local_cache import LocalCache
+
+HASH_A = "a" * 64
+HASH_B = "b" * 64
+HASH_C = "c" * 64
+
+
+def unpack_hashes(payload: dict) -> list[str]:
+    """Hashes from a scan request body, packed string or array."""
+    hashes = payload["hashes"]
+    if isinstance(hashes, str):
+        return [hashes[i : i + 64] for i in range(0, len(hashes), 64)]
+    return hashes
+
+
+def verified_unless_b(payload: dict) -> tuple[int, dict]:
+    """Worker stand-in: every hash is verified except HASH_B."""
+    return 200, {
+        "results": [
+            {"hash": h, "status": "unknown"}
+            if h == HASH_B
+            else {"hash": h, "status": "verified", "plugin": {"name": "Plugin", "nexusId": 1}}
+            for h in unpack_hashes(payload)
+        ]
+    }
+
+
+class FakeSession:
+    """Stands in for requests.Session, recording each scan request body."""
+
+    def __init__(self, respond=verified_unless_b):
+        self.payloads: list[dict] = []
+        self.respond = respond
+        self._lock = threading.Lock()
+
+    def post(self, url: str, data: bytes, timeout: int) -> SimpleNamespace:
+        payload = orjson.loads(data)
+        with self._lock:
+            self.payloads.append(payload)
+        status_code, body = self.respond(payload)
+        content = body if isinstance(body, bytes) else orjson.dumps(body)
+        return SimpleNamespace(status_code=status_code, content=content)
+
+
+@pytest.fixture
+def session() -> FakeSession:
+    return FakeSession()
+
+
+@pytest.fixture
+def client(session: FakeSession) -> SentinelClient:
+    """A SentinelClient whose requests go to a FakeSession."""
+    client = SentinelClient(base_url="http://sentinel.test")
+    client.session = session
+    return client
+
+
+class FakeClient:
+    """Stands in for SentinelClient, recording each scan request."""
+
+    def __init__(self, error: Exception | None = None):
+        self.calls: list[list[str]] = []
+        self.error = error
+        self.release = threading.Event()
+        self.release.set()
+
+    def scan(self, hashes: list[str]) -> ScanResponse:
+        self.calls.append(hashes)
+        self.release.wait(timeout=5)
+        if self.error:
+            raise self.error
+        results = [ScanResult(hash=h, status="verified") for h in hashes]
+        return ScanResponse(
+            scanned=len(results), verified=len(results), unknown=0, revoked=0, results=results
+        )
+
+
+class TestSentinelClientMemo:
+    """Tests for SentinelClient.scan memoization and dedup."""
+
+    def test_known_results_are_not_resent(self, client: SentinelClient, session: FakeSession):
+        """Verified results are memoized; unknown ones are asked about again."""
+        client.scan([HASH_A, HASH_B])
+        response = client.scan([HASH_A, HASH_B])
+
+        assert [unpack_hashes(p) for p in session.payloads] == [[HASH_A, HASH_B], [HASH_B]]
+        assert [r.status for r in response.results] == ["verified", "unknown"]
+
+    def test_memo_evicts_least_recently_used(self, client: SentinelClient, session: FakeSession):
+        """Past MEMO_SIZE, the least recently used result should be forgotten."""
+        client.MEMO_SIZE = 2
+        client.scan([HASH_A])
+        client.scan([HASH_C])
+        client.scan([HASH_A])  # HASH_C is now the oldest
+        client.scan(["d" * 64])
+        session.payloads.clear()
+
+        client.scan([HASH_A, HASH_C])
+
+        assert [unpack_hashes(p) for p in session.payloads] == [[HASH_C]]
+
+    def test_duplicates_sent_once(self, client: SentinelClient, session: FakeSession):
+        """Repeated hashes in one scan share a lookup but each get a result."""
+        response = client.scan([HASH_A, HASH_A.upper(), HASH_B])
+
+        assert [unpack_hashes(p) for p in session.payloads] == [[HASH_A, HASH_B]]
+        assert [r.hash for r in response.results] == [HASH_A, HASH_A, HASH_B]
+        assert (response.scanned, response.verified, response.unknown) == (3, 2, 1)
+
+
+class TestSentinelClientBatching:
+    """Tests for splitting large scans into worker-sized requests."""
+
+    def test_splits_at_max_batch_size(self, client: SentinelClient, session: FakeSession):
+        """More than MAX_BATCH_SIZE hashes should go out in batches, results in order."""
+        hashes = [f"{i:064x}" for i in range(2 * SentinelClient.MAX_BATCH_SIZE + 1)]
+
+        response = client.scan(hashes)
+
+        sizes = sorted(len(unpack_hashes(p)) for p in session.payloads)
+        assert sizes == [1, SentinelClient.MAX_BATCH_SIZE, SentinelClient.MAX_BATCH_SIZE]
+        assert [r.hash for r in response.results] == hashes
+
+
+class StubWorker(BaseHTTPRequestHandler):
+    """Answers scans with the server's queued status codes; None drops the connection."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:
+            self.server.requests += 1
+            status = self.server.statuses.pop(0)
+        if status is None:
+            self.close_connection = True
+            return
+        body = orjson.dumps({"results": []} if status == 200 else {"error": "Gateway"})
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_worker():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWorker)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.statuses = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestSentinelClientRetry:
+    """Tests for the session's retry policy."""
+
+    def worker_client(self, server: ThreadingHTTPServer) -> SentinelClient:
+        return SentinelClient(base_url=f"http://127.0.0.1:{server.server_port}", timeout=5)
+
+    def test_retries_gateway_errors(self, stub_worker: ThreadingHTTPServer):
+        """502/503/504 should be retried until the worker answers."""
+        stub_worker.statuses = [502, 503, 200]
+
+        response = self.worker_client(stub_worker).scan([HASH_A])
+
+        assert stub_worker.requests == 3
+        assert response.results[0].status == "unknown"
+
+    def test_does_not_retry_dropped_connection(self, stub_worker: ThreadingHTTPServer):
+        """A read error should fail fast so HybridVerifier can fall back."""
+        stub_worker.statuses = [None, 200]
+
+        with pytest.raises(requests.ConnectionError):
+            self.worker_client(stub_worker).scan([HASH_A])
+        assert stub_worker.requests == 1
+
+    def test_does_not_retry_other_errors(self, stub_worker: ThreadingHTTPServer):
+        """Other error statuses should surface immediately."""
+        stub_worker.statuses = [500, 200]
+
+        with pytest.raises(SentinelAPIError):
+            self.worker_client(stub_worker).scan([HASH_A])
+        assert stub_worker.requests == 1
+
+
+class TestSentinelClientPayload:
+    """Tests for the scan request body and response parsing."""
+
+    def test_sends_packed_hash_string(self, client: SentinelClient, session: FakeSession):
+        """SHA-256 hashes should go out as one concatenated string."""
+        client.scan([HASH_A, HASH_B])
+
+        assert session.payloads == [{"hashes": HASH_A + HASH_B}]
+
+    def test_falls_back_to_array_on_invalid_request(self, client: SentinelClient):
+        """An older worker rejecting the packed string should get an array from then on."""
+
+        def array_only(payload: dict) -> tuple[int, dict]:
+            if isinstance(payload["hashes"], str):
+                return 400, {"error": "Invalid request", "code": "INVALID_REQUEST"}
+            return verified_unless_b(payload)
+
+        session = client.session = FakeSession(array_only)
+        response = client.scan([HASH_A])
+        client.scan([HASH_C])
+
+        assert response.results[0].status == "verified"
+        assert session.payloads == [
+            {"hashes": HASH_A},
+            {"hashes": [HASH_A]},
+            {"hashes": [HASH_C]},
+        ]
+
+    def test_non_sha256_input_sent_as_array(self, client: SentinelClient, session: FakeSession):
+        """Hashes that can't be split back apart should not be packed."""
+        client.scan(["abc"])
+
+        assert session.payloads == [{"hashes": ["abc"]}]
+
+    def test_non_json_response_raises_request_error(self, client: SentinelClient):
+        """An HTML error page should surface as requests' InvalidJSONError."""
+        client.session = FakeSession(lambda payload: (502, b"<html>Bad Gateway</html>"))
+
+        with pytest.raises(requests.exceptions.InvalidJSONError) as e:
+            client.scan([HASH_A])
+        assert isinstance(e.value, requests.RequestException)
+        assert e.value.response.status_code == 502
+
+
+class TestBatchingSentinelClient:
+    """Tests for BatchingSentinelClient."""
+
+    def test_coalesces_lookups_into_one_request(self):
+        """Hashes queued together should share one scan, once per unique hash."""
+        fake = FakeClient()
+        batcher = BatchingSentinelClient(fake, batch_interval_ms=60_000)
+
+        futures = [batcher.scan_async(h) for h in (HASH_A, HASH_B.upper(), HASH_A)]
+        batcher.close()
+
+        assert fake.calls == [[HASH_A, HASH_B]]
+        assert [f.result(timeout=5).hash for f in futures] == [HASH_A, HASH_B, HASH_A]
+        assert all(f.result().status == "verified" for f in futures)
+
+    def test_full_batch_does_not_block_caller(self):
+        """Filling a batch should send it in the background."""
+        fake = FakeClient()
+        fake.release.clear()
+        batcher = BatchingSentinelClient(fake, batch_interval_ms=60_000, max_batch_size=2)
+
+        first = batcher.scan_async(HASH_A)
+        second = batcher.scan_async(HASH_B)
+        assert not second.done()
+
+        fake.release.set()
+        assert first.result(timeout=5).hash == HASH_A
+        assert second.result(timeout=5).hash == HASH_B
+        batcher.close()
+
+    def test_error_reaches_every_waiting_future(self):
+        """A failed scan should fail all futures in the batch, duplicates included."""
+        fake = FakeClient(error=SentinelAPIError("Rate limited", "RATE_LIMITED"))
+        batcher = BatchingSentinelClient(fake, batch_interval_ms=1)
+
+        futures = [batcher.scan_async(h) for h in (HASH_A, HASH_A, HASH_B)]
+
+        for future in futures:
+            with pytest.raises(SentinelAPIError):
+                future.result(timeout=5)
+        batcher.close()
+
+        with pytest.raises(RuntimeError):
+            batcher.scan_async(HASH_A)
+
+
+class TestVerifyStream:
+    """Tests for HybridVerifier.verify_stream."""
+
+    def test_stalled_producer_does_not_hold_back_batch(self, tmp_path: Path):
+        """A hash should be verified and yielded while the producer is still busy."""
+        cache = LocalCache(tmp_path / "sentinel.db")
+        verifier = HybridVerifier(base_url="http://127.0.0.1:9", cache=cache)
+        fake = FakeClient()
+        verifier.verify = fake.scan
+        resumed = threading.Event()
+
+        def producer():
+            yield HASH_A
+            resumed.wait(timeout=5)
+            yield HASH_B
+
+        stream = verifier.verify_stream(producer())
+        start = time.monotonic()
+        first = next(stream)
+        elapsed = time.monotonic() - start
+        resumed.set()
+
+        assert first.hash == HASH_A
+        assert elapsed < 1
+        assert fake.calls[0] == [HASH_A]
+        assert [r.hash for r in stream] == [HASH_B]
+        cache.close()
+
+    def test_producer_error_is_raised(self, tmp_path: Path):
+        """An exception in the source should reach the consumer after earlier results."""
+        cache = LocalCache(tmp_path / "sentinel.db")
+        verifier = HybridVerifier(base_url="http://127.0.0.1:9", cache=cache)
+        verifier.verify = FakeClient().scan
+
+        def producer():
+            yield HASH_A
+            raise OSError("scan failed")
+
+        results = []
+        with pytest.raises(OSError, match="scan failed"):
+            results.extend(r.hash for r in verifier.verify_stream(producer()))
+        assert results == [HASH_A]
+        cache.close()
+
+    def test_cache_fallback_keeps_duplicates(self, tmp_path: Path):
+        """Offline, every input hash should still get its own result."""
+        cache = LocalCache(tmp_path / "sentinel.db")
+        verifier = HybridVerifier(base_url="http://sentinel.test", cache=cache)
+        verifier.client.session = FakeSession(lambda payload: (503, {"error": "Unavailable"}))
+
+        results = list(verifier.verify_stream([HASH_A, HASH_B, HASH_A]))
+
+        assert verifier.last_source == "cached"
+        assert [r.hash for r in results] == [HASH_A, HASH_B, HASH_A]
+        assert all(r.status == "unknown" and r.source == "cached" for r in results)
+        cache.close()
@@ -0,0 +1,141 @@
+"""
+Tests for the Skyrim Sentinel local cache.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+# Import the module under test
+from local_cache import LocalCache
+
+VERIFIED_HASH = "ab" * 32
+REVOKED_HASH = "cd" * 32
+MISSING_HASH = "ef" * 32
+
+
+@pytest.fixture
+def golden_set(tmp_path: Path) -> Path:
+    """A minimal golden_set.json with one verified and one revoked file."""
+    path = tmp_path / "golden_set.json"
+    path.write_text(
+        json.dumps(
+            {
+                "version": "1",
+                "plugins": [
+                    {
+                        "name": "Test Plugin",
+                        "nexusId": 42,
+                        "files": [
+                            {"filename": "Test.dll", "sha256": VERIFIED_HASH},
+                            {"filename": "Old.dll", "sha256": REVOKED_HASH, "status": "revoked"},
+                        ],
+                    }
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path: Path, golden_set: Path):
+    """A LocalCache on a temporary database, loaded from the golden set."""
+    cache = LocalCache(tmp_path / "sentinel.db")
+    cache.load_from_golden_set(golden_set)
+    yield cache
+    cache.close()
+
+
+class TestLocalCache:
+    """Tests for LocalCache lookups."""
+
+    def test_get_hits_and_misses(self, cache: LocalCache):
+        """get should find stored hashes in any case and reject invalid ones."""
+        plugin = cache.get(VERIFIED_HASH)
+        assert plugin is not None
+        assert (plugin.name, plugin.nexus_id, plugin.filename) == ("Test Plugin", 42, "Test.dll")
+        assert cache.get(REVOKED_HASH.upper()).status == "revoked"
+        assert cache.get(MISSING_HASH) is None
+        assert cache.get("not-a-hash") is None
+        assert cache.get("ab" * 16) is None
+
+    def test_get_batch(self, cache: LocalCache):
+        """get_batch should map every input, lowercased, to its entry or None."""
+        results = cache.get_batch([VERIFIED_HASH.upper(), MISSING_HASH, "zz" * 32, REVOKED_HASH])
+
+        assert set(results) == {VERIFIED_HASH, MISSING_HASH, "zz" * 32, REVOKED_HASH}
+        assert results[VERIFIED_HASH].name == "Test Plugin"
+        assert results[REVOKED_HASH].status == "revoked"
+        assert results[MISSING_HASH] is None
+        assert results["zz" * 32] is None
+
+    def test_get_batch_during_another_write(self, tmp_path: Path, cache: LocalCache):
+        """A batch lookup should not need the write lock another connection holds."""
+        writer = sqlite3.connect(tmp_path / "sentinel.db", isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        cache._conn.execute("PRAGMA busy_timeout=100")
+
+        results = cache.get_batch([VERIFIED_HASH, MISSING_HASH])
+
+        writer.execute("ROLLBACK")
+        writer.close()
+        assert results[VERIFIED_HASH].name == "Test Plugin"
+        assert results[MISSING_HASH] is None
+
+    def test_sees_writes_from_another_instance(self, tmp_path: Path, golden_set: Path):
+        """Hashes loaded through another connection should not be filtered out."""
+        reader = LocalCache(tmp_path / "shared.db")
+        assert reader.get(VERIFIED_HASH) is None
+
+        writer = LocalCache(tmp_path / "shared.db")
+        writer.load_from_golden_set(golden_set)
+        writer.close()
+
+        assert reader.get(VERIFIED_HASH).name == "Test Plugin"
+        assert reader.get_batch([REVOKED_HASH])[REVOKED_HASH].status == "revoked"
+        reader.close()
+
+    def test_rebuilds_v1_text_schema(self, tmp_path: Path, golden_set: Path):
+        """A v1 cache storing hex TEXT hashes should be dropped and reloadable."""
+        db_path = tmp_path / "old.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE hashes (sha256 TEXT PRIMARY KEY, name TEXT NOT NULL, "
+            "nexus_id INTEGER NOT NULL, filename TEXT, status TEXT DEFAULT 'verified')"
+        )
+        conn.execute("INSERT INTO hashes VALUES (?, 'Stale', 1, NULL, 'verified')", (MISSING_HASH,))
+        conn.commit()
+        conn.close()
+
+        cache = LocalCache(db_path)
+        assert cache.count() == 0
+
+        assert cache.load_from_golden_set(golden_set) == 2
+        assert cache.get(VERIFIED_HASH).name == "Test Plugin"
+        cache.close()
+
+
+class TestFileCache:
+    """Tests for the per-file hash cache."""
+
+    def test_round_trip(self, cache: LocalCache):
+        """A stored file hash should come back for the same path and stat."""
+        cache.put_file_hashes([("/mods/Test.dll", 10, 1_000, 7, VERIFIED_HASH)])
+
+        assert cache.get_file_hash("/mods/Test.dll", 10, 1_000, 7) == VERIFIED_HASH
+        assert cache.get_file_hash("/mods/Other.dll", 10, 1_000, 7) is None
+
+    @pytest.mark.parametrize(
+        "size, mtime_ns, inode",
+        [(11, 1_000, 7), (10, 1_001, 7), (10, 1_000, 8)],
+        ids=["size", "mtime", "inode"],
+    )
+    def test_miss_when_stat_changes(self, cache: LocalCache, size: int, mtime_ns: int, inode: int):
+        """Any change to size, mtime or inode should force a rehash."""
+        cache.put_file_hashes([("/mods/Test.dll", 10, 1_000, 7, VERIFIED_HASH)])
+
+        assert cache.get_file_hash("/mods/Test.dll", size, mtime_ns, inode) is None
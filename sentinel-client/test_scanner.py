@@ -0,0 +1,81 @@
+"""
+Tests for the Skyrim Sentinel DLL scanner.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+# Import the module under test
+import scanner
+from local_cache import LocalCache
+
+
+@pytest.fixture
+def file_cache(tmp_path: Path):
+    cache = LocalCache(tmp_path / "sentinel.db")
+    yield cache
+    cache.close()
+
+
+class TestFindDlls:
+    """Tests for find_dlls."""
+
+    def test_includes_symlinked_dlls(self, tmp_path: Path):
+        """Symlinked DLLs should be found; symlinked directories not followed."""
+        store = tmp_path / "store"
+        store.mkdir()
+        (store / "Linked.dll").write_bytes(b"linked")
+        mods = tmp_path / "mods"
+        (mods / "SKSE" / "Plugins").mkdir(parents=True)
+        (mods / "SKSE" / "Plugins" / "Real.DLL").write_bytes(b"real")
+        (mods / "Linked.dll").symlink_to(store / "Linked.dll")
+        (mods / "Broken.dll").symlink_to(store / "Missing.dll")
+        (mods / "Loop").symlink_to(mods, target_is_directory=True)
+
+        names = sorted(entry.name for entry in scanner.find_dlls(mods))
+
+        assert names == ["Linked.dll", "Real.DLL"]
+
+
+class TestScanDirectory:
+    """Tests for scan_directory."""
+
+    def test_file_cache_skips_unchanged_files(
+        self, tmp_path: Path, file_cache: LocalCache, monkeypatch: pytest.MonkeyPatch
+    ):
+        """A second scan should reuse stored hashes instead of reading files."""
+        mods = tmp_path / "mods"
+        mods.mkdir()
+        (mods / "Test.dll").write_bytes(b"plugin")
+        first = scanner.scan_directory(mods, file_cache=file_cache)
+
+        def fail(path):
+            raise AssertionError(f"{path} was rehashed")
+
+        monkeypatch.setattr(scanner, "hash_file", fail)
+        second = scanner.scan_directory(mods, file_cache=file_cache)
+
+        assert second == first
+        assert first[0]["sha256"] == hashlib.sha256(b"plugin").hexdigest()
+
+    def test_file_cache_rehashes_replaced_file(self, tmp_path: Path, file_cache: LocalCache):
+        """A file swapped in with the same size and mtime should be hashed again."""
+        mods = tmp_path / "mods"
+        mods.mkdir()
+        dll = mods / "Test.dll"
+        dll.write_bytes(b"plugin")
+        scanner.scan_directory(mods, file_cache=file_cache)
+        st = dll.stat()
+
+        # Like `cp -p`: new inode, same size and timestamps
+        replacement = tmp_path / "Tampered.dll"
+        replacement.write_bytes(b"PLUGIN")
+        os.utime(replacement, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(replacement, dll)
+
+        results = scanner.scan_directory(mods, file_cache=file_cache)
+
+        assert results[0]["sha256"] == hashlib.sha256(b"PLUGIN").hexdigest()
@@ -2,15 +2,21 @@
 Skyrim Sentinel - Main Application Window
 """
 
-import json
+import sqlite3
+import sys
 import threading
+import time
+from collections import Counter
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from tkinter import filedialog
 
 import customtkinter as ctk
+import orjson
 
 from api_client import SentinelAPIError, SentinelClient
+from local_cache import LocalCache
 from scanner import scan_directory
 from version import __version__
 
@@ -18,46 +24,208 @@ from version import __version__
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+# Result rows handed to the UI thread per after() callback
+ROW_BATCH_SIZE = 50
 
-class ResultsTable(ctk.CTkScrollableFrame):
-    """Scrollable table for displaying scan results."""
+# Minimum seconds between progress updates posted from the scan thread
+UI_POST_INTERVAL = 0.05
+
+# Status colors
+_STATUS_COLORS = {
+    "verified": "#22c55e",  # Green
+    "unknown": "#eab308",  # Yellow
+    "revoked": "#ef4444",  # Red
+    "error": "#6b7280",  # Gray
+}
+
+# Shared font tuples for the results table
+_HDR_FONT = ("", 13, "bold")
+_BADGE_FONT = ("", 12, "bold")
+_HASH_FONT = ("", 10)
+
+
+class ResultsTable(ctk.CTkFrame):
+    """
+    Scrollable table for displaying scan results.
+
+    Rows are stored as plain tuples and only the rows that fit in the
+    viewport get widgets. Scrolling rebinds a fixed pool of row widgets
+    instead of creating one set per result.
+    """
+
+    # Unscaled heights of the header and of one result row (label + pady)
+    HEADER_HEIGHT = 38
+    ROW_HEIGHT = 34
+
+    # Rows scrolled per mouse wheel notch on X11
+    WHEEL_ROWS = 3
 
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         self.grid_columnconfigure(0, weight=1)
-        self.grid_columnconfigure(1, weight=0)
-        self.grid_columnconfigure(2, weight=1)
-        self.grid_columnconfigure(3, weight=0)
-        self.rows = []
+        self.grid_rowconfigure(0, weight=1)
+        self.data: list[tuple[str, str, str | None, str | None]] = []
         self.master_app = master  # Reference to copy to clipboard
 
+        self._widget_pool: list[tuple] = []
+        self._first = 0  # Index in self.data of the top visible row
+        self._page_rows = 0  # Rows that fully fit in the viewport
+
+        # Body holds the header and the pooled rows; it never grows with data
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=0, column=0, sticky="nsew")
+        self.body.grid_propagate(False)
+        self.body.grid_columnconfigure(0, weight=1)
+        self.body.grid_columnconfigure(1, weight=0)
+        self.body.grid_columnconfigure(2, weight=1)
+        self.body.grid_columnconfigure(3, weight=0)
+        self.body.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.body)
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
         # Header
         self._add_header()
 
     def _add_header(self):
         """Add table header row."""
-        ctk.CTkLabel(self, text="File", font=("", 13, "bold"), anchor="w").grid(
+        ctk.CTkLabel(self.body, text="File", font=_HDR_FONT, anchor="w").grid(
             row=0, column=0, padx=10, pady=5, sticky="w"
         )
 
-        ctk.CTkLabel(self, text="Status", font=("", 13, "bold")).grid(
+        ctk.CTkLabel(self.body, text="Status", font=_HDR_FONT).grid(
             row=0, column=1, padx=10, pady=5
         )
 
-        ctk.CTkLabel(self, text="Plugin", font=("", 13, "bold"), anchor="w").grid(
+        ctk.CTkLabel(self.body, text="Plugin", font=_HDR_FONT, anchor="w").grid(
             row=0, column=2, padx=10, pady=5, sticky="w"
         )
 
-        ctk.CTkLabel(self, text="Hash", font=("", 13, "bold"), anchor="w").grid(
+        ctk.CTkLabel(self.body, text="Hash", font=_HDR_FONT, anchor="w").grid(
             row=0, column=3, padx=10, pady=5, sticky="w"
         )
 
+    def _bind_wheel(self, widget):
+        """Scroll the table with the mouse wheel over a widget."""
+        widget.bind("<MouseWheel>", self._on_mousewheel)
+        widget.bind("<Button-4>", self._on_mousewheel)
+        widget.bind("<Button-5>", self._on_mousewheel)
+
+    def _add_pool_row(self):
+        """Create one reusable row of widgets below the existing ones."""
+        slot = len(self._widget_pool)
+        row = slot + 1
+
+        file_label = ctk.CTkLabel(self.body, text="", anchor="w")
+        file_label.grid(row=row, column=0, padx=10, pady=3, sticky="w")
+
+        status_label = ctk.CTkLabel(self.body, text="", font=_BADGE_FONT)
+        status_label.grid(row=row, column=1, padx=10, pady=3)
+
+        plugin_label = ctk.CTkLabel(self.body, text="", anchor="w")
+        plugin_label.grid(row=row, column=2, padx=10, pady=3, sticky="w")
+
+        # Hash (truncated, clickable to copy)
+        hash_label = ctk.CTkLabel(
+            self.body,
+            text="",
+            font=_HASH_FONT,
+            width=100,
+            anchor="w",
+            text_color="#888888",
+            cursor="hand2",
+        )
+        hash_label.grid(row=row, column=3, padx=10, pady=3, sticky="w")
+        hash_label.bind("<Button-1>", partial(self._on_hash_click, slot))
+
+        widgets = (file_label, status_label, plugin_label, hash_label)
+        for widget in widgets:
+            self._bind_wheel(widget)
+        self._widget_pool.append(widgets)
+
+    def _on_resize(self, event):
+        """Grow the widget pool to cover the new viewport height."""
+        header = self._apply_widget_scaling(self.HEADER_HEIGHT)
+        row_height = self._apply_widget_scaling(self.ROW_HEIGHT)
+        self._page_rows = max(1, int((event.height - header) // row_height))
+
+        # One extra row fills the partially visible bottom edge
+        while len(self._widget_pool) < self._page_rows + 1:
+            self._add_pool_row()
+        self._scroll_to(self._first)
+
+    def _yview(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, "units")."""
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * len(self.data)))
+        elif args[0] == "scroll":
+            self._scroll_to(self._first + int(args[1]))
+
+    def _on_mousewheel(self, event):
+        """Translate a platform mouse wheel event into a row offset."""
+        if event.num == 4:
+            step = -self.WHEEL_ROWS
+        elif event.num == 5:
+            step = self.WHEEL_ROWS
+        elif sys.platform.startswith("win"):
+            step = -int(event.delta / 40)
+        else:
+            step = -event.delta
+        self._scroll_to(self._first + step)
+
+    def _scroll_to(self, first: int):
+        """Show rows starting at the given data index."""
+        self._first = max(0, min(first, len(self.data) - self._page_rows))
+        self._refresh_visible()
+
+    def _refresh_visible(self):
+        """Rebind every pooled row to the data it currently shows."""
+        for slot in range(len(self._widget_pool)):
+            self._bind_slot(slot)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        """Sync the scrollbar thumb with the visible window."""
+        total = len(self.data)
+        if total <= self._page_rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._first / total, (self._first + self._page_rows) / total)
+
+    def _bind_slot(self, slot: int):
+        """Update one pooled row's widgets from self.data."""
+        file_label, status_label, plugin_label, hash_label = self._widget_pool[slot]
+        index = self._first + slot
+        if index >= len(self.data):
+            file_label.configure(text="")
+            status_label.configure(text="")
+            plugin_label.configure(text="")
+            hash_label.configure(text="")
+            return
+
+        filename, status, plugin_name, sha256 = self.data[index]
+        color = _STATUS_COLORS.get(status, "#6b7280")
+
+        file_label.configure(text=filename)
+        status_label.configure(text=status.upper(), text_color=color)
+        plugin_label.configure(text=plugin_name or "—")
+        if sha256:
+            hash_label.configure(text=f"{sha256[:12]}...", text_color="#888888")
+        else:
+            hash_label.configure(text="—", text_color="#555555")
+
     def clear(self):
         """Clear all result rows."""
-        for widgets in self.rows:
-            for widget in widgets:
-                widget.destroy()
-        self.rows = []
+        self.data = []
+        self._first = 0
+        self._refresh_visible()
+
+    def _on_hash_click(self, slot: int, event=None):
+        """Copy the hash of the row shown in the clicked pooled slot."""
+        index = self._first + slot
+        if index < len(self.data) and self.data[index][3]:
+            self._copy_hash(self.data[index][3])
 
     def _copy_hash(self, full_hash: str):
         """Copy hash to clipboard and show feedback."""
@@ -71,54 +239,13 @@ class ResultsTable(ctk.CTkScrollableFrame):
         self, filename: str, status: str, plugin_name: str | None, sha256: str | None = None
     ):
         """Add a result row with color-coded status."""
-        row = len(self.rows) + 1
-
-        # Status colors
-        colors = {
-            "verified": "#22c55e",  # Green
-            "unknown": "#eab308",  # Yellow
-            "revoked": "#ef4444",  # Red
-            "error": "#6b7280",  # Gray
-        }
-        color = colors.get(status, "#6b7280")
-
-        # Filename
-        file_label = ctk.CTkLabel(self, text=filename, anchor="w")
-        file_label.grid(row=row, column=0, padx=10, pady=3, sticky="w")
-
-        # Status badge
-        status_label = ctk.CTkLabel(
-            self,
-            text=status.upper(),
-            text_color=color,
-            font=("", 12, "bold"),
-        )
-        status_label.grid(row=row, column=1, padx=10, pady=3)
-
-        # Plugin name
-        plugin_text = plugin_name or "—"
-        plugin_label = ctk.CTkLabel(self, text=plugin_text, anchor="w")
-        plugin_label.grid(row=row, column=2, padx=10, pady=3, sticky="w")
+        self.data.append((filename, status, plugin_name, sha256))
 
-        # Hash (truncated, clickable to copy)
-        if sha256:
-            hash_btn = ctk.CTkButton(
-                self,
-                text=f"{sha256[:12]}...",
-                font=("", 10),
-                width=100,
-                height=24,
-                fg_color="transparent",
-                text_color="#888888",
-                hover_color="#333333",
-                command=lambda h=sha256: self._copy_hash(h),
-            )
-            hash_btn.grid(row=row, column=3, padx=10, pady=3, sticky="w")
-            self.rows.append((file_label, status_label, plugin_label, hash_btn))
-        else:
-            hash_label = ctk.CTkLabel(self, text="—", text_color="#555555")
-            hash_label.grid(row=row, column=3, padx=10, pady=3, sticky="w")
-            self.rows.append((file_label, status_label, plugin_label, hash_label))
+        # Only a row that lands inside the viewport needs its widgets touched
+        slot = len(self.data) - 1 - self._first
+        if slot < len(self._widget_pool):
+            self._bind_slot(slot)
+        self._update_scrollbar()
 
 
 class SentinelApp(ctk.CTk):
@@ -131,13 +258,20 @@ class SentinelApp(ctk.CTk):
         self.geometry("900x600")
         self.minsize(700, 400)
 
-        # API client
+        # API client (memoizes verdicts for the session)
         self.api = SentinelClient()
 
+        # Remembers file hashes between runs so unchanged DLLs aren't re-read
+        try:
+            self.file_cache: LocalCache | None = LocalCache()
+        except sqlite3.Error, OSError:
+            self.file_cache = None
+
         # State
         self.selected_path: Path | None = None
         self.is_scanning = False
         self.last_scan_results: list[dict] = []  # Store for export
+        self._last_ui_post = 0.0  # monotonic time of the last progress update
 
         self._create_widgets()
 
@@ -168,13 +302,23 @@ class SentinelApp(ctk.CTk):
         folder_frame.grid_columnconfigure(1, weight=1)
 
         self.path_label = ctk.CTkLabel(folder_frame, text="No folder selected", anchor="w")
-        self.path_label.grid(row=0, column=0, columnspan=2, padx=10, pady=(10, 5), sticky="ew")
+        self.path_label.grid(row=0, column=0, columnspan=3, padx=10, pady=(10, 5), sticky="ew")
 
         browse_btn = ctk.CTkButton(
             folder_frame, text="Browse...", command=self._select_folder, width=100
         )
         browse_btn.grid(row=1, column=0, padx=10, pady=10)
 
+        # Ignore remembered file hashes and read every DLL again
+        self.full_rehash = ctk.BooleanVar(value=False)
+        rehash_check = ctk.CTkCheckBox(
+            folder_frame,
+            text="Rehash all files",
+            variable=self.full_rehash,
+            font=("", 12),
+        )
+        rehash_check.grid(row=1, column=1, padx=10, pady=10, sticky="e")
+
         self.scan_btn = ctk.CTkButton(
             folder_frame,
             text="Scan",
@@ -183,7 +327,7 @@ class SentinelApp(ctk.CTk):
             fg_color="#22c55e",
             hover_color="#16a34a",
         )
-        self.scan_btn.grid(row=1, column=1, padx=10, pady=10, sticky="e")
+        self.scan_btn.grid(row=1, column=2, padx=10, pady=10, sticky="e")
 
         # Progress bar
         self.progress = ctk.CTkProgressBar(self)
@@ -249,22 +393,35 @@ class SentinelApp(ctk.CTk):
         self.results_table.clear()
         self.progress.set(0)
 
+        file_cache = None if self.full_rehash.get() else self.file_cache
+
         # Run in background thread
-        thread = threading.Thread(target=self._scan_thread, daemon=True)
+        thread = threading.Thread(target=self._scan_thread, args=(file_cache,), daemon=True)
         thread.start()
 
-    def _scan_thread(self):
-        """Background scanning thread."""
+    def _scan_thread(self, file_cache: LocalCache | None):
+        """Background scanning thread; file_cache is None for a full rehash."""
         try:
             # Phase 1: Find and hash DLLs
             self._update_status("Scanning for DLLs...")
 
+            self._last_ui_post = 0.0
+
             def progress_callback(current, total, filename):
+                # Redrawing per file costs more than hashing small DLLs;
+                # post at most every UI_POST_INTERVAL, but always the last one
+                now = time.monotonic()
+                if current < total and now - self._last_ui_post < UI_POST_INTERVAL:
+                    return
+                self._last_ui_post = now
+
                 progress = current / total if total > 0 else 0
-                self.after(0, lambda: self.progress.set(progress * 0.5))
-                self.after(0, lambda: self._update_status(f"Hashing: {filename}"))
+                self.after(0, self.progress.set, progress * 0.5)
+                self._update_status(f"Hashing: {filename}")
 
-            scan_results = scan_directory(self.selected_path, progress_callback)
+            scan_results = scan_directory(
+                self.selected_path, progress_callback, file_cache=file_cache
+            )
 
             if not scan_results:
                 self._update_status("No DLL files found")
@@ -273,7 +430,8 @@ class SentinelApp(ctk.CTk):
 
             # Filter out errors and get hashes
             valid_results = [r for r in scan_results if r.get("sha256")]
-            hashes = [r["sha256"] for r in valid_results]
+            # The same DLL often ships in several mods; ask about each hash once
+            hashes = list(dict.fromkeys(r["sha256"] for r in valid_results))
 
             if not hashes:
                 self._update_status("No valid DLL files to verify")
@@ -282,17 +440,18 @@ class SentinelApp(ctk.CTk):
 
             # Phase 2: Verify with API
             self._update_status("Verifying hashes...")
-            self.after(0, lambda: self.progress.set(0.6))
+            self.after(0, self.progress.set, 0.6)
 
             try:
                 api_response = self.api.scan(hashes)
-                self.after(0, lambda: self.progress.set(0.9))
+                self.after(0, self.progress.set, 0.9)
 
                 # Build hash -> result mapping
                 hash_to_result = {r.hash: r for r in api_response.results}
 
                 # Store results for export and display
                 combined_results = []
+                rows = []
                 for local_result in valid_results:
                     h = local_result["sha256"]
                     api_result = hash_to_result.get(h)
@@ -311,38 +470,30 @@ class SentinelApp(ctk.CTk):
                         }
                     )
 
-                    self.after(
-                        0,
-                        lambda f=local_result["filename"],
-                        s=status,
-                        p=plugin,
-                        h=h: self.results_table.add_result(f, s, p, h),
-                    )
+                    rows.append((local_result["filename"], status, plugin, h))
 
                 # Store for export
                 self.last_scan_results = combined_results
 
                 # Enable export if there are unknowns
-                unknown_count = sum(1 for r in combined_results if r["status"] == "unknown")
-                if unknown_count > 0:
-                    self.after(0, lambda: self.export_btn.configure(state="normal"))
+                status_counts = Counter(r["status"] for r in combined_results)
+                if status_counts["unknown"] > 0:
+                    self.after(0, partial(self.export_btn.configure, state="normal"))
 
                 # Add errors
-                for r in scan_results:
-                    if r.get("error"):
-                        err_filename = r["filename"]
-                        err_msg = r.get("error")
-                        self.after(
-                            0,
-                            lambda f=err_filename, e=err_msg: self.results_table.add_result(
-                                f, "error", e
-                            ),
-                        )
+                rows.extend(
+                    (r["filename"], "error", r["error"]) for r in scan_results if r.get("error")
+                )
+                self._post_rows(rows)
 
                 # Summary
-                summary = f"Done: {api_response.verified} verified, {api_response.unknown} unknown"
-                if api_response.revoked > 0:
-                    summary += f", {api_response.revoked} REVOKED!"
+                # Per-file counts; the API response counts unique hashes
+                summary = (
+                    f"Done: {status_counts['verified']} verified, "
+                    f"{status_counts['unknown']} unknown"
+                )
+                if status_counts["revoked"] > 0:
+                    summary += f", {status_counts['revoked']} REVOKED!"
                 self._update_status(summary)
 
             except SentinelAPIError as e:
@@ -350,14 +501,12 @@ class SentinelApp(ctk.CTk):
             except Exception as e:
                 self._update_status(f"Connection Error: {e}")
                 # Still show local results as unknown
-                for r in valid_results:
-                    h = r["sha256"]
-                    self.after(
-                        0,
-                        lambda f=r["filename"], h=h: self.results_table.add_result(
-                            f, "unknown", "API unavailable", h
-                        ),
-                    )
+                self._post_rows(
+                    [
+                        (r["filename"], "unknown", "API unavailable", r["sha256"])
+                        for r in valid_results
+                    ]
+                )
                 # Store for offline export
                 self.last_scan_results = [
                     {
@@ -370,21 +519,31 @@ class SentinelApp(ctk.CTk):
                     }
                     for r in valid_results
                 ]
-                self.after(0, lambda: self.export_btn.configure(state="normal"))
+                self.after(0, partial(self.export_btn.configure, state="normal"))
 
         except Exception as e:
             self._update_status(f"Error: {e}")
         finally:
             self._finish_scan()
 
+    def _post_rows(self, rows: list[tuple]):
+        """Schedule result rows for display in chunks of ROW_BATCH_SIZE."""
+        for i in range(0, len(rows), ROW_BATCH_SIZE):
+            self.after(0, self._flush_rows, rows[i : i + ROW_BATCH_SIZE])
+
+    def _flush_rows(self, rows: list[tuple]):
+        """Add a chunk of result rows to the table (UI thread)."""
+        for row in rows:
+            self.results_table.add_result(*row)
+
     def _update_status(self, text: str):
         """Update status label (thread-safe)."""
-        self.after(0, lambda: self.status_label.configure(text=text))
+        self.after(0, partial(self.status_label.configure, text=text))
 
     def _finish_scan(self):
         """Reset scan state."""
-        self.after(0, lambda: self.progress.set(1.0))
-        self.after(0, lambda: self.scan_btn.configure(state="normal"))
+        self.after(0, self.progress.set, 1.0)
+        self.after(0, partial(self.scan_btn.configure, state="normal"))
         self.is_scanning = False
 
     def _export_unknown(self):
@@ -425,8 +584,8 @@ class SentinelApp(ctk.CTk):
         }
 
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(export_data, f, indent=2)
+            with open(filepath, "wb") as f:
+                f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
             self._update_status(f"Exported {len(unknown)} unknown hashes")
         except OSError as e:
             self._update_status(f"Export failed: {e}")
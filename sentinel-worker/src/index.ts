@@ -37,6 +37,24 @@ async function checkRateLimit(
 	}
 }
 
+// ============================================================================
+// Request Helpers
+// ============================================================================
+
+const SHA256_HEX_LENGTH = 64;
+
+/**
+ * Split a string of concatenated SHA-256 hex digests into individual hashes.
+ * A trailing partial chunk is kept so hash format validation rejects it.
+ */
+function splitHashString(packed: string): string[] {
+	const hashes: string[] = [];
+	for (let i = 0; i < packed.length; i += SHA256_HEX_LENGTH) {
+		hashes.push(packed.slice(i, i + SHA256_HEX_LENGTH));
+	}
+	return hashes;
+}
+
 // ============================================================================
 // Middleware
 // ============================================================================
@@ -101,17 +119,23 @@ app.post("/api/v1/scan", async (c) => {
 		return c.json(response, 400);
 	}
 
-	// Validate request
-	if (!body.hashes || !Array.isArray(body.hashes)) {
+	// Validate request: either a hash array, or all hashes concatenated into
+	// one string (64 hex chars each) to keep large payloads compact
+	let hashes: string[];
+	if (typeof body.hashes === "string") {
+		hashes = splitHashString(body.hashes);
+	} else if (Array.isArray(body.hashes)) {
+		hashes = body.hashes;
+	} else {
 		const response: ErrorResponse = {
 			error: "Missing or invalid 'hashes' field",
 			code: "INVALID_REQUEST",
-			details: "Expected { hashes: string[] }",
+			details: "Expected { hashes: string[] | string }",
 		};
 		return c.json(response, 400);
 	}
 
-	if (body.hashes.length === 0) {
+	if (hashes.length === 0) {
 		const response: ErrorResponse = {
 			error: "Empty hashes array",
 			code: "EMPTY_HASHES",
@@ -121,7 +145,7 @@ app.post("/api/v1/scan", async (c) => {
 
 	// Limit batch size to prevent abuse
 	const MAX_BATCH_SIZE = 500;
-	if (body.hashes.length > MAX_BATCH_SIZE) {
+	if (hashes.length > MAX_BATCH_SIZE) {
 		const response: ErrorResponse = {
 			error: `Batch size exceeds limit of ${MAX_BATCH_SIZE}`,
 			code: "BATCH_TOO_LARGE",
@@ -131,7 +155,7 @@ app.post("/api/v1/scan", async (c) => {
 
 	// Validate hash format (should be 64 hex chars for SHA-256)
 	const hashRegex = /^[a-f0-9]{64}$/i;
-	const invalidHashes = body.hashes.filter((h) => !hashRegex.test(h));
+	const invalidHashes = hashes.filter((h) => !hashRegex.test(h));
 	if (invalidHashes.length > 0) {
 		const response: ErrorResponse = {
 			error: "Invalid hash format",
@@ -142,7 +166,7 @@ app.post("/api/v1/scan", async (c) => {
 	}
 
 	// Normalize hashes to lowercase
-	const normalizedHashes = body.hashes.map((h) => h.toLowerCase());
+	const normalizedHashes = hashes.map((h) => h.toLowerCase());
 
 	// Lookup each hash in KV
 	const results: ScanResult[] = [];
@@ -23,10 +23,11 @@ export interface KVPluginEntry {
 // ============================================================================
 
 /**
- * POST /api/v1/scan request body
+ * POST /api/v1/scan request body.
+ * `hashes` may also be all hashes concatenated into one string.
  */
 export interface ScanRequest {
-	hashes: string[];
+	hashes: string[] | string;
 }
 
 /**
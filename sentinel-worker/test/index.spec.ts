@@ -110,6 +110,36 @@ describe("Skyrim Sentinel API", () => {
 			});
 		});
 
+		it("accepts hashes concatenated into one string", async () => {
+			const hashA = "c".repeat(64);
+			const hashB = "d".repeat(64);
+
+			const response = await SELF.fetch("https://example.com/api/v1/scan", {
+				method: "POST",
+				headers: { "Content-Type": "application/json" },
+				body: JSON.stringify({ hashes: hashA + hashB }),
+			});
+
+			expect(response.status).toBe(200);
+			const body = await response.json();
+
+			expect(body).toHaveProperty("scanned", 2);
+			expect(body.results[0]).toMatchObject({ hash: hashA, status: "unknown" });
+			expect(body.results[1]).toMatchObject({ hash: hashB, status: "unknown" });
+		});
+
+		it("rejects concatenated string with a partial hash", async () => {
+			const response = await SELF.fetch("https://example.com/api/v1/scan", {
+				method: "POST",
+				headers: { "Content-Type": "application/json" },
+				body: JSON.stringify({ hashes: "e".repeat(64) + "abc" }),
+			});
+
+			expect(response.status).toBe(400);
+			const body = await response.json();
+			expect(body.code).toBe("INVALID_HASH_FORMAT");
+		});
+
 		it("returns proper response structure", async () => {
 			const validHash = "b".repeat(64);
 
@@ -0,0 +1,47 @@
+"""
+Skyrim Sentinel - Manifest I/O Helpers
+
+Shared JSON load/save for golden_set.json and the scan result files used
+by the Golden Set tools.
+"""
+
+import os
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+
+def load_manifest(manifest_path: Path) -> Any:
+    """
+    Load a JSON manifest.
+
+    Args:
+        manifest_path: Path to the JSON file
+
+    Returns:
+        Parsed JSON document
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        orjson.JSONDecodeError: If the file isn't valid JSON
+    """
+    with open(manifest_path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def save_manifest(manifest_path: Path, manifest: Any) -> None:
+    """
+    Write a manifest as indented JSON, atomically.
+
+    The JSON goes to a temporary file next to the target, which then
+    replaces it, so an interrupted run never leaves a truncated file.
+
+    Args:
+        manifest_path: Path to write, e.g. golden_set.json
+        manifest: Parsed manifest to serialize
+    """
+    tmp_path = manifest_path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, manifest_path)
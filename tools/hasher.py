@@ -1,90 +1,216 @@
 """
 Skyrim Sentinel - DLL Hasher Utility
 
-Generates SHA-256 hashes for DLL files in a memory-efficient manner.
+Generates SHA-256 hashes for DLL files using memory-mapped reads.
 Used to build and update the Golden Set database.
 """
 
 import hashlib
-import json
+import mmap
+import os
 import sys
 from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import UTC, datetime
 from pathlib import Path
 
-# 64KB chunks for memory-efficient hashing
-CHUNK_SIZE = 65536
+import ijson
+import orjson
 
+from _manifest import load_manifest, save_manifest
 
-def hash_file(file_path: Path) -> str:
+# hashlib releases the GIL while hashing a mapped file, so threads run in
+# parallel and share the page cache; extra workers overlap disk reads
+MAX_WORKERS = min(32, (os.cpu_count() or 4) * 2)
+
+
+def hash_file_with_size(file_path: Path) -> tuple[str, int]:
     """
-    Generate SHA-256 hash of a file using chunked reading.
+    Generate SHA-256 hash of a file and return its size.
+
+    The size comes from fstat on the already-open file, so callers don't
+    need a separate stat() call. The file is memory-mapped and hashed in a
+    single update, so the kernel pages it straight into the hash without
+    intermediate Python buffers. Files that can't be mapped (empty or
+    special files) are streamed with hashlib.file_digest, which also runs
+    its read loop in C.
 
     Args:
         file_path: Path to the file to hash
 
     Returns:
-        Lowercase hex string of the SHA-256 hash
+        Tuple of (lowercase hex SHA-256, size in bytes)
 
     Raises:
         FileNotFoundError: If the file doesn't exist
         PermissionError: If the file can't be read
     """
-    sha256 = hashlib.sha256()
-
     with open(file_path, "rb") as f:
-        while chunk := f.read(CHUNK_SIZE):
-            sha256.update(chunk)
+        size = os.fstat(f.fileno()).st_size
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return hashlib.file_digest(f, "sha256").hexdigest(), size
+
+        with mm:
+            return hashlib.sha256(mm).hexdigest(), size
+
+
+def hash_file(file_path: Path) -> str:
+    """
+    Generate SHA-256 hash of a file.
+
+    Args:
+        file_path: Path to the file to hash
+
+    Returns:
+        Lowercase hex string of the SHA-256 hash
 
-    return sha256.hexdigest()
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        PermissionError: If the file can't be read
+    """
+    return hash_file_with_size(file_path)[0]
 
 
 def find_dll_files(directory: Path) -> Iterator[Path]:
     """
     Recursively find all .dll files in a directory.
 
+    Walks with os.scandir so file types come from the directory listing
+    instead of a stat per entry. Matching is case-insensitive. Symlinked
+    DLLs (as deployed by mod managers) are included, but symlinked
+    directories are not descended into, so link loops can't recurse.
+    Unreadable subdirectories are skipped.
+
     Args:
         directory: Root directory to search
 
     Yields:
         Path objects for each .dll file found
     """
-    yield from directory.rglob("*.dll")
+    stack = [os.fspath(directory)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.lower().endswith(".dll") and entry.is_file():
+                        yield Path(entry.path)
+        except OSError:
+            continue
 
 
-def scan_directory(directory: Path, verbose: bool = True) -> list[dict]:
+def load_hash_cache(cache_path: Path) -> dict[str, list]:
+    """
+    Load hashes remembered from previous scans.
+
+    Args:
+        cache_path: Path to the JSON cache file
+
+    Returns:
+        Dict of absolute path -> [mtime_ns, size_bytes, sha256]; empty if the
+        file is missing or unreadable
+    """
+    try:
+        with open(cache_path, "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+
+
+def save_hash_cache(cache_path: Path, cache: dict[str, list]) -> None:
+    """
+    Write the hash cache for the next scan.
+
+    Args:
+        cache_path: Path to the JSON cache file
+        cache: Dict as returned by load_hash_cache
+    """
+    with open(cache_path, "wb") as f:
+        f.write(orjson.dumps(cache))
+
+
+def scan_directory(
+    directory: Path,
+    verbose: bool = True,
+    cache: dict[str, list] | None = None,
+) -> list[dict]:
     """
     Scan a directory for DLL files and generate hashes.
 
+    Files are hashed in parallel on a thread pool. Results keep the
+    discovery order; progress is printed as each file completes.
+    With a cache, files whose mtime and size are unchanged since the last
+    scan reuse their stored hash, and newly hashed files are added to it.
+
     Args:
         directory: Directory to scan
         verbose: Print progress to stderr
+        cache: Optional dict from load_hash_cache, updated in place
 
     Returns:
         List of dicts with filename, path, and sha256 keys
     """
-    results = []
     dll_files = list(find_dll_files(directory))
-    total = len(dll_files)
-
-    for i, dll_path in enumerate(dll_files, 1):
-        if verbose:
-            print(f"[{i}/{total}] Hashing: {dll_path.name}", file=sys.stderr)
-
-        try:
-            file_hash = hash_file(dll_path)
-            results.append(
-                {
-                    "filename": dll_path.name,
-                    "path": str(dll_path.relative_to(directory)),
-                    "sha256": file_hash,
-                    "size_bytes": dll_path.stat().st_size,
-                }
-            )
-        except (PermissionError, OSError) as e:
-            print(f"  [ERROR] {e}", file=sys.stderr)
-
-    return results
+    if not dll_files:
+        return []
+
+    results: list[dict | None] = [None] * len(dll_files)
+    stats: dict[int, tuple[str, int]] = {}
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {}
+        for i, dll_path in enumerate(dll_files):
+            if cache is not None:
+                try:
+                    st = dll_path.stat()
+                except OSError as e:
+                    print(f"  [ERROR] {e}", file=sys.stderr)
+                    continue
+
+                key = os.path.abspath(dll_path)
+                cached = cache.get(key)
+                if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                    results[i] = _scan_entry(directory, dll_path, cached[2], st.st_size)
+                    continue
+                stats[i] = (key, st.st_mtime_ns)
+
+            futures[executor.submit(hash_file_with_size, dll_path)] = i
+
+        total = len(futures)
+        if verbose and total < len(dll_files):
+            print(f"Reused {len(dll_files) - total} cached hashes", file=sys.stderr)
+
+        for done, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            dll_path = dll_files[index]
+            if verbose:
+                print(f"[{done}/{total}] Hashed: {dll_path.name}", file=sys.stderr)
+
+            try:
+                file_hash, size = future.result()
+            except (PermissionError, OSError) as e:
+                print(f"  [ERROR] {e}", file=sys.stderr)
+                continue
+
+            results[index] = _scan_entry(directory, dll_path, file_hash, size)
+            if index in stats:
+                key, mtime_ns = stats[index]
+                cache[key] = [mtime_ns, size, file_hash]
+
+    return [r for r in results if r is not None]
+
+
+def _scan_entry(directory: Path, dll_path: Path, file_hash: str, size: int) -> dict:
+    """Build the scan result dict for one DLL."""
+    return {
+        "filename": dll_path.name,
+        "path": str(dll_path.relative_to(directory)),
+        "sha256": file_hash,
+        "size_bytes": size,
+    }
 
 
 def update_golden_set(
@@ -95,34 +221,39 @@ def update_golden_set(
     """
     Update golden_set.json with new hash entries.
 
+    The manifest is left untouched when there is nothing to add.
+
     Args:
         hashes: List of hash results from scan_directory
         manifest_path: Path to golden_set.json
         plugin_name: If specified, add hashes only to this plugin
     """
-    with open(manifest_path, encoding="utf-8") as f:
-        manifest = json.load(f)
-
-    manifest["generated"] = datetime.now(UTC).isoformat()
-
-    if plugin_name:
-        # Add to specific plugin
-        for plugin in manifest["plugins"]:
-            if plugin["name"] == plugin_name:
-                for h in hashes:
-                    plugin["files"].append(
-                        {
-                            "filename": h["filename"],
-                            "sha256": h["sha256"],
-                            "size_bytes": h["size_bytes"],
-                            "status": "pending",
-                            "added": datetime.now(UTC).isoformat(),
-                        }
-                    )
-                break
+    if not hashes or not plugin_name:
+        return
+
+    manifest = load_manifest(manifest_path)
+
+    # Add to specific plugin
+    plugin = next((p for p in manifest["plugins"] if p["name"] == plugin_name), None)
+    if plugin is None:
+        return
+
+    # One timestamp for the whole update
+    now_iso = datetime.now(UTC).isoformat()
+    manifest["generated"] = now_iso
+
+    for h in hashes:
+        plugin["files"].append(
+            {
+                "filename": h["filename"],
+                "sha256": h["sha256"],
+                "size_bytes": h["size_bytes"],
+                "status": "pending",
+                "added": now_iso,
+            }
+        )
 
-    with open(manifest_path, "w", encoding="utf-8") as f:
-        json.dump(manifest, f, indent=2)
+    save_manifest(manifest_path, manifest)
 
 
 def export_for_kv(manifest_path: Path, output_path: Path) -> None:
@@ -130,37 +261,41 @@ def export_for_kv(manifest_path: Path, output_path: Path) -> None:
     Export golden_set.json to Cloudflare KV bulk upload format.
 
     Creates a JSON array of {key, value} objects for wrangler kv:bulk put.
+    Plugins are parsed from the manifest one at a time and their entries
+    written one per line as they are produced, so memory stays flat as
+    the golden set grows. Values are serialized without whitespace to
+    keep KV storage small.
 
     Args:
         manifest_path: Path to golden_set.json
         output_path: Path to write KV bulk upload file
     """
-    with open(manifest_path, encoding="utf-8") as f:
-        manifest = json.load(f)
-
-    kv_entries = []
-
-    for plugin in manifest["plugins"]:
-        for file_entry in plugin.get("files", []):
-            if file_entry.get("sha256"):
-                kv_entries.append(
-                    {
-                        "key": f"sha256:{file_entry['sha256']}",
-                        "value": json.dumps(
-                            {
-                                "name": plugin["name"],
-                                "nexusId": plugin["nexusId"],
-                                "filename": file_entry["filename"],
-                                "status": file_entry.get("status", "verified"),
-                            }
-                        ),
-                    }
-                )
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(kv_entries, f, indent=2)
+    count = 0
+
+    with open(manifest_path, "rb") as f, open(output_path, "wb") as out:
+        out.write(b"[")
+        for plugin in ijson.items(f, "plugins.item"):
+            # Plugin fields are the same for every file: serialize them once
+            # and leave the object open for the per-file fields
+            base = orjson.dumps({"name": plugin["name"], "nexusId": plugin["nexusId"]})[:-1]
+            for file_entry in plugin.get("files", []):
+                if file_entry.get("sha256"):
+                    value = (
+                        base
+                        + b',"filename":'
+                        + orjson.dumps(file_entry["filename"])
+                        + b',"status":'
+                        + orjson.dumps(file_entry.get("status", "verified"))
+                        + b"}"
+                    ).decode()
+                    out.write(b",\n  " if count else b"\n  ")
+                    out.write(
+                        orjson.dumps({"key": f"sha256:{file_entry['sha256']}", "value": value})
+                    )
+                    count += 1
+        out.write(b"\n]\n" if count else b"]\n")
 
-    print(f"Exported {len(kv_entries)} entries to {output_path}", file=sys.stderr)
+    print(f"Exported {count} entries to {output_path}", file=sys.stderr)
 
 
 def main():
@@ -178,6 +313,11 @@ def main():
     scan_parser = subparsers.add_parser("scan", help="Scan directory for DLLs")
     scan_parser.add_argument("directory", type=Path, help="Directory to scan")
     scan_parser.add_argument("--output", "-o", type=Path, help="Output JSON file (default: stdout)")
+    scan_parser.add_argument(
+        "--cache",
+        type=Path,
+        help="JSON file of hashes from previous scans, reused for unchanged files",
+    )
 
     # hash command
     hash_parser = subparsers.add_parser("hash", help="Hash a single file")
@@ -203,14 +343,17 @@ def main():
     args = parser.parse_args()
 
     if args.command == "scan":
-        results = scan_directory(args.directory)
-        output = json.dumps(results, indent=2)
+        cache = load_hash_cache(args.cache) if args.cache else None
+        results = scan_directory(args.directory, cache=cache)
+        if args.cache:
+            save_hash_cache(args.cache, cache)
+        output = orjson.dumps(results, option=orjson.OPT_INDENT_2)
 
         if args.output:
-            args.output.write_text(output)
+            args.output.write_bytes(output)
             print(f"Wrote {len(results)} entries to {args.output}", file=sys.stderr)
         else:
-            print(output)
+            print(output.decode())
 
     elif args.command == "hash":
         if not args.file.exists():
@@ -4,23 +4,28 @@ Skyrim Sentinel - Hash Merge Utility
 Merges new_hashes.json into golden_set.json, creating plugin entries as needed.
 """
 
-import json
 from datetime import UTC, datetime
 from pathlib import Path
 
+from _manifest import load_manifest, save_manifest
+
 
 def merge_hashes() -> None:
     """Merge newly scanned hashes from new_hashes.json into golden_set.json."""
     golden_path = Path("tools/golden_set.json")
     new_hashes_path = Path("tools/new_hashes.json")
 
-    with open(golden_path, encoding="utf-8") as f:
-        golden = json.load(f)
+    golden = load_manifest(golden_path)
+    new_hashes = load_manifest(new_hashes_path)
 
-    with open(new_hashes_path, encoding="utf-8") as f:
-        new_hashes = json.load(f)
+    # One timestamp for the whole run
+    now = datetime.now(UTC)
+    now_iso = now.isoformat()
 
     plugins_map = {p["name"]: p for p in golden["plugins"]}
+    # Filenames already present per plugin, built on first use
+    seen_files: dict[str, set[str]] = {}
+    dirty = False
 
     for entry in new_hashes:
         path_parts = entry["path"].split("\\")
@@ -39,11 +44,14 @@ def merge_hashes() -> None:
             }
             golden["plugins"].append(new_plugin)
             plugins_map[plugin_name] = new_plugin
+            dirty = True
 
         plugin = plugins_map[plugin_name]
+        if plugin_name not in seen_files:
+            seen_files[plugin_name] = {f["filename"] for f in plugin["files"]}
 
         # Check if file exists
-        if any(f["filename"] == entry["filename"] for f in plugin["files"]):
+        if entry["filename"] in seen_files[plugin_name]:
             continue
 
         plugin["files"].append(
@@ -52,15 +60,19 @@ def merge_hashes() -> None:
                 "sha256": entry["sha256"],
                 "size_bytes": entry["size_bytes"],
                 "status": "verified",  # Assuming local scan is trusted
-                "added": datetime.now(UTC).isoformat(),
+                "added": now_iso,
             }
         )
+        seen_files[plugin_name].add(entry["filename"])
+        dirty = True
         print(f"Added {entry['filename']} to {plugin_name}")
 
-    golden["version"] = datetime.now(UTC).strftime("%Y.%m.%d")
+    if not dirty:
+        print("Nothing to merge.")
+        return
 
-    with open(golden_path, "w", encoding="utf-8") as f:
-        json.dump(golden, f, indent=2)
+    golden["version"] = now.strftime("%Y.%m.%d")
+    save_manifest(golden_path, golden)
 
     print("Merge complete.")
 
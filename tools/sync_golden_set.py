@@ -4,9 +4,10 @@ Skyrim Sentinel - Golden Set Sync Utility
 Matches scanned DLL hashes with known plugin names in golden_set.json.
 """
 
-import json
 from pathlib import Path
 
+from _manifest import load_manifest, save_manifest
+
 
 def sync_golden_set() -> None:
     """Sync scan_results.json hashes into golden_set.json for known plugins."""
@@ -14,11 +15,8 @@ def sync_golden_set() -> None:
     golden_path = root / "golden_set.json"
     scan_path = root / "scan_results.json"
 
-    with open(golden_path, encoding="utf-8") as f:
-        golden = json.load(f)
-
-    with open(scan_path, encoding="utf-8") as f:
-        scan_results = json.load(f)
+    golden = load_manifest(golden_path)
+    scan_results = load_manifest(scan_path)
 
     # Create filename -> result map
     scan_map = {r["filename"].lower(): r for r in scan_results}
@@ -86,36 +84,36 @@ def sync_golden_set() -> None:
     }
 
     updated_count = 0
+    by_name = {p["name"]: p for p in golden["plugins"]}
+
+    # Only mapped plugins can match, so walk the map instead of every plugin
+    for plugin_name, target_dll in name_map.items():
+        plugin = by_name.get(plugin_name)
+        if plugin is None or not target_dll:
+            continue
+
+        matched_result = scan_map.get(target_dll.lower())
+        if not matched_result:
+            continue
 
-    for plugin in golden["plugins"]:
         # Skip if already verified (has file with sha256)
-        if plugin.get("files") and any(f.get("sha256") for f in plugin["files"]):
+        if any(f.get("sha256") for f in plugin.get("files", [])):
             continue
 
-        target_dll = name_map.get(plugin["name"])
-        matched_result = None
-
-        if target_dll:
-            matched_result = scan_map.get(target_dll.lower())
-        else:
-            # Fallback: exact match filename?
-            # Or try basic name matching
-            pass
-
-        if matched_result:
-            plugin["files"] = [
-                {
-                    "filename": matched_result["filename"],
-                    "sha256": matched_result["sha256"],
-                    "size_bytes": matched_result["size_bytes"],
-                    "status": "verified",
-                }
-            ]
-            print(f"Matched: {plugin['name']} -> {matched_result['filename']}")
-            updated_count += 1
-
-    with open(golden_path, "w", encoding="utf-8") as f:
-        json.dump(golden, f, indent=2)
+        plugin["files"] = [
+            {
+                "filename": matched_result["filename"],
+                "sha256": matched_result["sha256"],
+                "size_bytes": matched_result["size_bytes"],
+                "status": "verified",
+            }
+        ]
+        print(f"Matched: {plugin_name} -> {matched_result['filename']}")
+        updated_count += 1
+
+    # Leave golden_set.json untouched on a no-op run
+    if updated_count:
+        save_manifest(golden_path, golden)
 
     print(f"Updated {updated_count} plugins with verified hashes.")
 
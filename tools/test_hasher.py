@@ -4,50 +4,56 @@ Tests for the Skyrim Sentinel hasher utility.
 
 import hashlib
 import json
+import os
 from pathlib import Path
 
 import pytest
 
 # Import the module under test
-from hasher import find_dll_files, hash_file, scan_directory
+from _manifest import load_manifest, save_manifest
+from hasher import (
+    export_for_kv,
+    find_dll_files,
+    hash_file,
+    hash_file_with_size,
+    scan_directory,
+)
+
+
+@pytest.fixture(scope="session", params=["empty", "small", "large"])
+def known_payload(request) -> tuple[bytes, str]:
+    """File contents with their expected SHA-256, generated once per session."""
+    if request.param == "large":
+        # Random bytes so the 1 MiB case isn't a trivially uniform input
+        content = os.urandom(1024 * 1024)
+    else:
+        content = {"empty": b"", "small": b"Hello, Skyrim Sentinel!"}[request.param]
+    return content, hashlib.sha256(content).hexdigest()
 
 
 class TestHashFile:
     """Tests for hash_file function."""
 
-    def test_hash_known_content(self, tmp_path: Path):
-        """Hash of known content should match expected value."""
-        test_file = tmp_path / "test.bin"
-        test_content = b"Hello, Skyrim Sentinel!"
-        test_file.write_bytes(test_content)
+    def test_hash_known_payloads(self, tmp_path: Path, known_payload: tuple[bytes, str]):
+        """Hash should match hashlib for empty, small and 1 MiB files."""
+        content, expected = known_payload
+        test_file = tmp_path / "payload.bin"
+        test_file.write_bytes(content)
 
-        expected = hashlib.sha256(test_content).hexdigest()
         result = hash_file(test_file)
 
         assert result == expected
         assert len(result) == 64  # SHA-256 produces 64 hex chars
 
-    def test_hash_empty_file(self, tmp_path: Path):
-        """Empty file should produce valid hash."""
-        test_file = tmp_path / "empty.bin"
-        test_file.write_bytes(b"")
-
-        expected = hashlib.sha256(b"").hexdigest()
-        result = hash_file(test_file)
-
-        assert result == expected
-
-    def test_hash_large_file(self, tmp_path: Path):
-        """Large file should be hashed correctly (tests chunking)."""
-        test_file = tmp_path / "large.bin"
-        # Create 1MB file
-        large_content = b"x" * (1024 * 1024)
-        test_file.write_bytes(large_content)
+    def test_hash_with_size(self, tmp_path: Path):
+        """hash_file_with_size should return the hash and the file size."""
+        test_file = tmp_path / "sized.bin"
+        test_content = b"sized content"
+        test_file.write_bytes(test_content)
 
-        expected = hashlib.sha256(large_content).hexdigest()
-        result = hash_file(test_file)
+        result = hash_file_with_size(test_file)
 
-        assert result == expected
+        assert result == (hashlib.sha256(test_content).hexdigest(), len(test_content))
 
     def test_hash_nonexistent_file(self, tmp_path: Path):
         """Nonexistent file should raise FileNotFoundError."""
@@ -73,6 +79,30 @@ class TestFindDllFiles:
         filenames = {f.name for f in results}
         assert filenames == {"plugin.dll", "other.dll"}
 
+    def test_matches_extension_case_insensitively(self, tmp_path: Path):
+        """Should find .DLL files and skip directories named like DLLs."""
+        (tmp_path / "UPPER.DLL").write_bytes(b"dll")
+        (tmp_path / "folder.dll").mkdir()
+
+        results = list(find_dll_files(tmp_path))
+
+        assert [f.name for f in results] == ["UPPER.DLL"]
+
+    def test_includes_symlinked_dlls(self, tmp_path: Path):
+        """Should find symlinked DLLs without following symlinked directories."""
+        store = tmp_path / "store"
+        store.mkdir()
+        (store / "linked.dll").write_bytes(b"dll")
+        mods = tmp_path / "mods"
+        mods.mkdir()
+        (mods / "linked.dll").symlink_to(store / "linked.dll")
+        (mods / "broken.dll").symlink_to(store / "missing.dll")
+        (mods / "loop").symlink_to(mods, target_is_directory=True)
+
+        results = list(find_dll_files(mods))
+
+        assert results == [mods / "linked.dll"]
+
     def test_empty_directory(self, tmp_path: Path):
         """Empty directory should return empty iterator."""
         results = list(find_dll_files(tmp_path))
@@ -105,6 +135,71 @@ class TestScanDirectory:
         expected = hashlib.sha256(content).hexdigest()
         assert results[0]["sha256"] == expected
 
+    def test_scan_reuses_cached_hash(self, tmp_path: Path):
+        """Unchanged files should take their hash from the cache."""
+        dll_path = tmp_path / "cached.dll"
+        dll_path.write_bytes(b"cached content")
+        cache = {}
+
+        scan_directory(tmp_path, verbose=False, cache=cache)
+        key = str(dll_path.absolute())
+        assert cache[key][2] == hashlib.sha256(b"cached content").hexdigest()
+
+        # A stored hash for the same mtime/size is returned without rehashing
+        cache[key][2] = "f" * 64
+        results = scan_directory(tmp_path, verbose=False, cache=cache)
+
+        assert results[0]["sha256"] == "f" * 64
+
+
+class TestExportForKv:
+    """Tests for export_for_kv function."""
+
+    def test_export_writes_kv_entries(self, tmp_path: Path):
+        """Only hashed files are exported, with compact JSON values."""
+        manifest = {
+            "version": "1",
+            "plugins": [
+                {
+                    "name": "Test Plugin",
+                    "nexusId": 42,
+                    "files": [
+                        {"filename": "test.dll", "sha256": "a" * 64},
+                        {"filename": "pending.dll", "sha256": None},
+                    ],
+                }
+            ],
+        }
+        manifest_path = tmp_path / "golden_set.json"
+        manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+        output_path = tmp_path / "kv_bulk.json"
+
+        export_for_kv(manifest_path, output_path)
+
+        entries = json.loads(output_path.read_text(encoding="utf-8"))
+        assert entries == [
+            {
+                "key": f"sha256:{'a' * 64}",
+                "value": '{"name":"Test Plugin","nexusId":42,"filename":"test.dll","status":"verified"}',
+            }
+        ]
+
+
+class TestManifest:
+    """Tests for the shared manifest helpers."""
+
+    def test_save_then_load_round_trips(self, tmp_path: Path):
+        """A saved manifest should load back, and overwrite without a leftover temp file."""
+        manifest_path = tmp_path / "golden_set.json"
+        save_manifest(manifest_path, {"version": "1", "plugins": []})
+
+        assert load_manifest(manifest_path) == {"version": "1", "plugins": []}
+
+        save_manifest(manifest_path, {"version": "2", "plugins": [{"name": "New"}]})
+
+        assert load_manifest(manifest_path)["version"] == "2"
+        assert not (tmp_path / "golden_set.tmp").exists()
+
 
 class TestGoldenSetSchema:
     """Tests for golden_set.json structure."""